@@ -21,6 +21,7 @@ def main():
     """Synchronous main function for entry point."""
     import contextlib
     import io
+    import re
     
     # Create a custom stderr that filters out cleanup errors
     class FilteredStderr:
@@ -32,10 +33,12 @@ def main():
                 'weakref.py', '_rmtree_unsafe', 'cleanup',
                 'OSError', '目录不是空的'
             ]
+            # One alternation scanned in a single pass instead of a substring search per keyword
+            self.cleanup_pattern = re.compile('|'.join(map(re.escape, self.cleanup_keywords)))
         
         def write(self, text):
             # Only write to stderr if it's not a cleanup error
-            if not any(keyword in text for keyword in self.cleanup_keywords):
+            if not self.cleanup_pattern.search(text):
                 self.original_stderr.write(text)
         
         def flush(self):
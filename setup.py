@@ -49,6 +49,9 @@ setup(
     python_requires=">=3.8",
     install_requires=requirements,
     extras_require={
+        "fast": [
+            "msgspec>=0.15",
+        ],
         "dev": [
             "pytest>=6.0",
             "pytest-asyncio>=0.18.0",
@@ -32,9 +32,11 @@ from .config import (
 from .utils import (
     parse_string_replacements,
     process_content_with_regex,
+    process_content,
     apply_string_replacements,
     sanitize_filename,
     extract_chapter_title,
+    extract_chapter_titles,
     sort_chapters_by_metadata,
 )
 from .metadata import (
@@ -66,9 +68,11 @@ __all__ = [
     # Utility functions
     "parse_string_replacements",
     "process_content_with_regex",
+    "process_content",
     "apply_string_replacements",
     "sanitize_filename",
     "extract_chapter_title",
+    "extract_chapter_titles",
     "sort_chapters_by_metadata",
     
     # Metadata functions
@@ -7,15 +7,17 @@ Handles command line argument parsing and command execution.
 import argparse
 import asyncio
 import json
+import logging
 import re
+import sys
 from datetime import datetime
 from pathlib import Path
 from typing import List
 
-from .config import chapters_dir, DEFAULT_CONCURRENCY, DEFAULT_OUTPUT_FILE, DEFAULT_NOVEL_TITLE, DEFAULT_AUTHOR, DEFAULT_FORMAT, DEFAULT_FILE_PATTERN
+from .config import chapters_dir, DEFAULT_CONCURRENCY, DEFAULT_OUTPUT_FILE, DEFAULT_NOVEL_TITLE, DEFAULT_AUTHOR, DEFAULT_FORMAT, DEFAULT_FILE_PATTERN, VERBOSE
 from .core import NovelDownloader
 from .utils import parse_string_replacements, sort_chapters_by_metadata
-from .metadata import find_best_metadata
+from .metadata import _hash_url, find_best_metadata
 from .epub_generator import create_epub
 
 
@@ -114,9 +116,7 @@ def extract_hash_from_metadata_file(metadata_file_path: str) -> str:
         # Try to extract hash from menu_url in metadata
         menu_url = metadata.get("menu_url", "")
         if menu_url:
-            import hashlib
-            url_hash = hashlib.md5(menu_url.encode('utf-8')).hexdigest()[:8]
-            return url_hash
+            return _hash_url(menu_url)
             
     except (json.JSONDecodeError, KeyError, FileNotFoundError) as e:
         print(f"Warning: Could not extract hash from metadata file: {e}")
@@ -284,6 +284,8 @@ def replace_chapter_strings(string_replacements: List[List[str]],
 def create_argument_parser() -> argparse.ArgumentParser:
     """Create and configure the argument parser."""
     parser = argparse.ArgumentParser(description="Novel Downloader with configurable XPath expressions")
+    parser.add_argument("-v", "--verbose", action='store_true',
+                        help="Show per-chapter processing details such as applied replacements")
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
     # Parse command - extract and store chapter information
@@ -320,6 +322,8 @@ def create_argument_parser() -> argparse.ArgumentParser:
                                 help="Run browser in headless mode (default: True)")
     download_parser.add_argument("--no-headless", action='store_false', dest='headless',
                                 help="Show browser window (overrides --headless)")
+    download_parser.add_argument("--force", action='store_true',
+                                help="Re-download chapters that already exist")
     
     # Merge command
     merge_parser = subparsers.add_parser('merge', help='Merge downloaded chapters')
@@ -387,8 +391,8 @@ async def execute_parse_command(args):
     )
     
     try:
-        await downloader.start_browser()
-        chapters = await downloader.parse_chapters(args.menu_url)
+        async with downloader:
+            chapters = await downloader.parse_chapters(args.menu_url)
         
         if chapters:
             print(f"\nParse Summary:")
@@ -401,21 +405,6 @@ async def execute_parse_command(args):
         print(f"❌ Error during parsing: {e}")
         import traceback
         traceback.print_exc()
-    finally:
-        try:
-            await downloader.stop_browser()
-        except Exception as e:
-            print(f"Warning: Error stopping browser: {e}")
-        
-        # Suppress internal cleanup exceptions that are not user-friendly
-        import sys
-        import io
-        from contextlib import redirect_stderr
-        
-        with redirect_stderr(io.StringIO()):
-            # Force cleanup
-            import gc
-            gc.collect()
 
 
 async def execute_download_command(args):
@@ -460,12 +449,13 @@ async def execute_download_command(args):
         string_replacements=string_replacements,
         chapter_pagination_xpath=chapter_pagination_xpath,
         chapter_list_pagination_xpath=chapter_list_pagination_xpath,
-        headless=args.headless
+        headless=args.headless,
+        force=args.force
     )
     
     try:
-        await downloader.start_browser()
-        stats = await downloader.download_novel(menu_url)
+        async with downloader:
+            stats = await downloader.download_novel(menu_url)
         
         print("\n📊 Download Summary:")
         print(f"Total chapters: {stats['total']}")
@@ -486,21 +476,6 @@ async def execute_download_command(args):
         print("   5. 确认网络连接是否正常")
         import traceback
         traceback.print_exc()
-    finally:
-        try:
-            await downloader.stop_browser()
-        except Exception as e:
-            print(f"Warning: Error stopping browser: {e}")
-        
-        # Suppress internal cleanup exceptions that are not user-friendly
-        import sys
-        import io
-        from contextlib import redirect_stderr
-        
-        with redirect_stderr(io.StringIO()):
-            # Force cleanup
-            import gc
-            gc.collect()
 
 
 def execute_merge_command(args):
@@ -562,6 +537,15 @@ async def main():
     parser = create_argument_parser()
     args = parser.parse_args()
     
+    # Downloader progress goes through logging; show it on stdout like the rest of the CLI output.
+    # Records are written synchronously so they stay in order with the commands' print() output.
+    # Only this package's logger is configured, so third-party INFO chatter (e.g. pydoll) stays hidden.
+    stdout_handler = logging.StreamHandler(sys.stdout)
+    stdout_handler.setFormatter(logging.Formatter("%(message)s"))
+    package_logger = logging.getLogger(__package__)
+    package_logger.addHandler(stdout_handler)
+    package_logger.setLevel(logging.DEBUG if args.verbose or VERBOSE else logging.INFO)
+    
     if args.command == 'parse':
         await execute_parse_command(args)
     elif args.command == 'download':
@@ -9,16 +9,25 @@ from pathlib import Path
 
 # Set environment variables to reduce temp file issues on Windows
 temp_dir = os.path.join(os.getcwd(), 'temp')
-os.makedirs(temp_dir, exist_ok=True)
+if not os.path.isdir(temp_dir):
+    os.makedirs(temp_dir, exist_ok=True)
 os.environ['PYDOLL_TEMP_DIR'] = temp_dir
 
 # Create chapters directory
 chapters_dir = Path('chapters')
-chapters_dir.mkdir(exist_ok=True)
+if not chapters_dir.is_dir():
+    chapters_dir.mkdir(exist_ok=True)
 
 # Create metadata directory for chapter information storage
 metadata_dir = Path('chapters/metadata')
-metadata_dir.mkdir(exist_ok=True)
+if not metadata_dir.is_dir():
+    metadata_dir.mkdir(exist_ok=True)
+
+# Metadata JSON is written compactly; set NOVEL_DOWNLOADER_PRETTY_METADATA=1 for indented, hand-editable files
+PRETTY_METADATA = os.environ.get('NOVEL_DOWNLOADER_PRETTY_METADATA') == '1'
+
+# Per-chapter processing details are logged at debug level; set NOVEL_DOWNLOADER_VERBOSE=1 (or pass --verbose) to show them
+VERBOSE = os.environ.get('NOVEL_DOWNLOADER_VERBOSE') == '1'
 
 # Default configuration values
 DEFAULT_CONCURRENCY = 3
@@ -5,22 +5,122 @@ Contains the main NovelDownloader class and related functionality.
 """
 
 import asyncio
+import gc
+import io
+import logging
 import re
+import shutil
 import tempfile
 import os
+from contextlib import asynccontextmanager, redirect_stderr
 from pathlib import Path
 from typing import List, Tuple, Optional, Dict, Any, cast
 from urllib.parse import urljoin
-from lxml import html
+import aiohttp
+from lxml import etree, html
 from pydoll.browser import Chrome
 from pydoll.constants import By
 from pydoll.elements.web_element import WebElement
 from pydoll.browser.options import ChromiumOptions
 
 from .config import chapters_dir, CLOUDFLARE_MAX_WAIT_TIME, CLOUDFLARE_CHECK_INTERVAL
-from .utils import process_content_with_regex, apply_string_replacements, sanitize_filename
+from .utils import _compile_content_regex, process_content, process_content_with_regex, apply_string_replacements, sanitize_filename
 from .metadata import MetadataManager
 
+logger = logging.getLogger(__name__)
+
+
+# Static XPath expressions shared by every downloader instance
+_TITLE_XPATH = etree.XPath("//title")
+_CLASSED_DIVS_XPATH = etree.XPath("//div[@class]")
+
+# Cloudflare challenge indicators, matched in a single pass over the title/page text
+_CF_TITLE_RE = re.compile(r"请稍候|Just a moment|Checking your browser|Please wait")
+_CF_BODY_RE = re.compile(
+    r"请完成以下操作，验证您是真人|请稍候|just a moment|checking your browser|verify you are human|complete the challenge",
+    re.IGNORECASE,
+)
+
+# Title lookup that avoids parsing the whole page while polling a challenge
+_TITLE_TAG_RE = re.compile(r'<title[^>]*>([^<]{0,500})</title>', re.IGNORECASE | re.DOTALL)
+
+# Browser session ID (32 hex characters) occasionally returned instead of page source
+_SESSION_ID_RE = re.compile(r'\A\s*[0-9A-Fa-f]{32}\s*\Z')
+
+# Error phrases checked by _validate_url, one named group per failure kind
+_VALIDATE_RE = re.compile(
+    r"(?P<notfound>page not found|404)"
+    r"|(?P<denied>access denied|forbidden)"
+    r"|(?P<timeout>timeout|timed out)"
+    r"|(?P<cf>cloudflare.*?checking your browser|checking your browser.*?cloudflare)",
+    re.IGNORECASE | re.DOTALL,
+)
+_VALIDATE_MESSAGES = {
+    "notfound": "[ERROR] 页面未找到 (404) - 章节链接可能已失效",
+    "denied": "[ERROR] 访问被拒绝 - 可能需要代理或网站限制访问",
+    "timeout": "[ERROR] 页面访问超时 - 网络连接不稳定",
+    "cf": "[ERROR] 页面被Cloudflare保护 - 正在验证浏览器",
+}
+_ERROR_HINT_RE = re.compile(r"error|not found|unavailable", re.IGNORECASE)
+
+# 404 page indicators used by _is_real_404_page
+_NOT_FOUND_PHRASES = (
+    # Common 404 error messages
+    "page not found",
+    "not found",
+    "404 error",
+    "404 not found",
+    "the page you requested was not found",
+    "the requested page could not be found",
+    "this page does not exist",
+    "page does not exist",
+    "content not found",
+    "article not found",
+    "post not found",
+    
+    # Chinese 404 messages
+    "页面未找到",
+    "页面不存在",
+    "文章不存在",
+    "内容不存在",
+    "找不到页面",
+    "页面丢失",
+    "内容已删除",
+    "文章已删除",
+)
+_NOT_FOUND_RE = re.compile("|".join(map(re.escape, _NOT_FOUND_PHRASES)), re.IGNORECASE)
+_TITLE_CONTENT_RE = re.compile(r'<title[^>]*>(.*?)</title>', re.IGNORECASE | re.DOTALL)
+_NOT_FOUND_TITLE_RE = re.compile(r"404|not found|页面未找到|页面不存在", re.IGNORECASE)
+
+# Browser identity shared by Chrome and the lightweight HTTP client
+_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+# Pooled tabs are closed and replaced after this many borrows
+_TAB_MAX_USES = 50
+
+# Settings that NovelDownloader.reconfigure can change without restarting the browser
+_RECONFIGURABLE_SETTINGS = frozenset({
+    "chapter_xpath", "content_xpath", "concurrency", "content_regex", "string_replacements",
+    "chapter_pagination_xpath", "chapter_list_pagination_xpath", "custom_hash", "force",
+})
+
+
+def _compile_href_xpath(expression: Optional[str]):
+    """
+    Compile a link XPath so that it returns href strings instead of elements.
+    
+    Args:
+        expression: XPath selecting link elements (or their @href attributes)
+        
+    Returns:
+        Compiled XPath returning plain href strings, or None if no expression is given
+    """
+    if not expression:
+        return None
+    if not expression.rstrip().endswith('@href'):
+        expression = f"({expression})/@href"
+    return etree.XPath(expression, smart_strings=False)
+
 
 class NovelDownloader:
     """Main class for downloading novels with configurable XPath expressions."""
@@ -36,7 +136,8 @@ class NovelDownloader:
                  chapter_list_pagination_xpath: Optional[str] = None,
                  headless: bool = True,
                  custom_hash: Optional[str] = None,
-                 chrome_path: Optional[str] = None):
+                 chrome_path: Optional[str] = None,
+                 force: bool = False):
         """
         Initialize the novel downloader.
         
@@ -52,6 +153,7 @@ class NovelDownloader:
             headless: Whether to run browser in headless mode (default: True)
             custom_hash: Optional custom hash for metadata file naming
             chrome_path: Optional path to Chrome executable
+            force: Re-download chapters even if their files already exist
         """
         self.chapter_xpath = chapter_xpath
         self.content_xpath = content_xpath
@@ -64,31 +166,82 @@ class NovelDownloader:
         self.headless = headless
         self.custom_hash = custom_hash
         self.chrome_path = chrome_path
+        self.force = force
         self.browser = None
+        self._user_data_dir: Optional[str] = None
+        self._http: Optional[aiohttp.ClientSession] = None
+        
+        # Reusable browser tabs, created on demand up to `concurrency`
+        self._tab_pool: Optional[asyncio.Queue] = None
+        self._tab_slots: Optional[asyncio.Semaphore] = None
+        self._tab_uses: Dict[int, int] = {}
         self.semaphore = asyncio.Semaphore(concurrency)
         self.metadata_manager = MetadataManager()
         
-    def _process_content(self, content: str) -> str:
+        # Reuse one HTML parser for every page instead of building one per parse.
+        # Comments are dropped while parsing and no id index is built, since lookups go through XPath
+        self._html_parser = html.HTMLParser(recover=True, encoding='utf-8', remove_comments=True,
+                                            collect_ids=False, huge_tree=True)
+        
+        self._compile_settings()
+    
+    def _compile_settings(self):
+        """Precompile the XPath expressions and content filters for the current settings."""
+        # Compile XPath expressions once instead of on every page
+        self._chapter_xpath = etree.XPath(self.chapter_xpath)
+        self._content_xpath = etree.XPath(self.content_xpath)
+        self._chapter_pagination_xpath = _compile_href_xpath(self.chapter_pagination_xpath)
+        self._chapter_list_pagination_xpath = _compile_href_xpath(self.chapter_list_pagination_xpath)
+        
+        # Compile the content filter once instead of once per chapter
+        self._content_regex_compiled = None
+        if self.content_regex:
+            try:
+                self._content_regex_compiled = _compile_content_regex(self.content_regex)
+            except re.error as e:
+                logger.error("❌ Invalid regex pattern: %s", e)
+        
+        # Pick the content processing steps once; chapters then run only the configured ones
+        content_pattern = self._content_regex_compiled
+        replacements = self.string_replacements
+        if not content_pattern and not replacements:
+            self._process_content = lambda content: content
+        elif not replacements:
+            self._process_content = lambda content: process_content_with_regex(content, content_pattern)
+        elif not content_pattern:
+            self._process_content = lambda content: apply_string_replacements(content, replacements)
+        else:
+            self._process_content = lambda content: process_content(content, content_pattern, replacements)
+    
+    def reconfigure(self, **settings):
         """
-        Process chapter content with regex filtering and string replacements.
+        Change extraction or download settings while keeping the running browser.
+        
+        Call this between operations, not while downloads are in progress.
         
         Args:
-            content: Raw content text from XPath extraction
+            **settings: New values for any of chapter_xpath, content_xpath, concurrency,
+                content_regex, string_replacements, chapter_pagination_xpath,
+                chapter_list_pagination_xpath, custom_hash and force
             
-        Returns:
-            Processed content text
+        Raises:
+            ValueError: If a setting is unknown or needs a browser restart (proxy, headless, chrome_path)
         """
-        processed_content = content
+        unknown = set(settings) - _RECONFIGURABLE_SETTINGS
+        if unknown:
+            raise ValueError(f"Cannot reconfigure: {', '.join(sorted(unknown))}")
         
-        # Apply regex filtering if specified
-        if self.content_regex:
-            processed_content = process_content_with_regex(processed_content, self.content_regex)
+        for name, value in settings.items():
+            setattr(self, name, value)
+        self.string_replacements = self.string_replacements or []
         
-        # Apply string replacements
-        if self.string_replacements:
-            processed_content = apply_string_replacements(processed_content, self.string_replacements)
+        if "concurrency" in settings:
+            self.semaphore = asyncio.Semaphore(self.concurrency)
+            if self._tab_pool is not None:
+                # Idle tabs stay pooled; only the number that may be open at once changes
+                self._tab_slots = asyncio.Semaphore(self.concurrency)
         
-        return processed_content
+        self._compile_settings()
         
     async def start_browser(self):
         """Start the browser instance."""
@@ -107,18 +260,25 @@ class NovelDownloader:
         options.add_argument('--disable-dev-shm-usage')
         options.add_argument('--no-sandbox')
         options.add_argument('--disable-gpu')
-        options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+        options.add_argument(f'--user-agent={_USER_AGENT}')
         # options.add_argument('--start-maximized')
         # options.add_argument('--disable-notifications')
         # Set user data directory to avoid temp file conflicts
-        user_data_dir = os.path.join(tempfile.gettempdir(), f"pydoll_browser_{os.getpid()}")
-        options.add_argument(f'--user-data-dir={user_data_dir}')
+        self._user_data_dir = os.path.join(tempfile.gettempdir(), f"pydoll_browser_{os.getpid()}")
+        options.add_argument(f'--user-data-dir={self._user_data_dir}')
         
         self.browser = Chrome(options=options)
         await self.browser.start()
         
     async def stop_browser(self):
         """Stop the browser instance."""
+        # Pooled tabs go away with the browser
+        self._tab_pool = None
+        self._tab_slots = None
+        self._tab_uses.clear()
+        if self._http is not None:
+            await self._http.close()
+            self._http = None
         if self.browser:
             try:
                 # Set a timeout for browser stop to prevent hanging
@@ -126,7 +286,7 @@ class NovelDownloader:
                 # Wait a bit for cleanup
                 await asyncio.sleep(2)
             except asyncio.TimeoutError:
-                print("Warning: Browser stop timed out, forcing cleanup...")
+                logger.warning("Warning: Browser stop timed out, forcing cleanup...")
                 # Force kill browser process if it doesn't stop gracefully
                 try:
                     if hasattr(self.browser, '_process') and self.browser._process:
@@ -140,48 +300,67 @@ class NovelDownloader:
                 # Ignore cleanup errors on Windows - these are typically temporary file cleanup issues
                 # that don't affect functionality. Only show warning for non-permission errors.
                 if not isinstance(e, (PermissionError, OSError)):
-                    print(f"Warning: Browser cleanup warning (can be ignored): {e}")
+                    logger.warning("Warning: Browser cleanup warning (can be ignored): %s", e)
                 pass
             finally:
                 self.browser = None
                 # Suppress internal cleanup exceptions that are not user-friendly
-                import sys
-                import io
-                from contextlib import redirect_stderr
-                
-                # Redirect stderr to suppress cleanup exceptions
                 with redirect_stderr(io.StringIO()):
                     # Force garbage collection to help with cleanup
-                    import gc
                     gc.collect()
                     
-                    # Additional cleanup for Windows
-                    try:
-                        import os
-                        import tempfile
-                        import shutil
-                        # Clean up any remaining temp files with retry mechanism
-                        temp_dir = os.environ.get('PYDOLL_TEMP_DIR', tempfile.gettempdir())
-                        if os.path.exists(temp_dir):
-                            # Try to clean up temp files with retry
-                            for _ in range(3):
-                                try:
-                                    # Only clean up our specific browser temp files
-                                    browser_temp_pattern = f"pydoll_browser_{os.getpid()}"
-                                    for item in os.listdir(temp_dir):
-                                        if browser_temp_pattern in item:
-                                            item_path = os.path.join(temp_dir, item)
-                                            if os.path.isdir(item_path):
-                                                shutil.rmtree(item_path, ignore_errors=True)
-                                            elif os.path.isfile(item_path):
-                                                os.remove(item_path)
-                                    break
-                                except (PermissionError, OSError):
-                                    await asyncio.sleep(1)  # Wait and retry
-                                    continue
-                    except:
-                        pass
+                    # Remove this process's browser profile directory, retrying while Windows holds file locks
+                    if self._user_data_dir:
+                        for _ in range(3):
+                            shutil.rmtree(self._user_data_dir, ignore_errors=True)
+                            if not os.path.exists(self._user_data_dir):
+                                break
+                            await asyncio.sleep(1)  # Wait and retry
+    
+    async def __aenter__(self) -> "NovelDownloader":
+        """Start the browser so one instance serves every call made inside the block."""
+        try:
+            await self.start_browser()
+        except BaseException:
+            await self.__aexit__(None, None, None)
+            raise
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        """Stop the browser; cleanup errors are reported but never replace the block's exception."""
+        try:
+            await self.stop_browser()
+        except Exception as e:
+            logger.warning("Warning: Error stopping browser: %s", e)
                 
+    def _parse(self, html_content: Optional[str], page_description: Optional[str] = None):
+        """
+        Sanity-check page source and parse it into an HTML tree.
+        
+        Args:
+            html_content: Page source returned by the browser
+            page_description: Description of the page used in warnings (no warnings if None)
+            
+        Returns:
+            Parsed HTML tree if the content looks like HTML, None otherwise
+        """
+        # Check if we got valid HTML content
+        if not html_content or len(html_content) < 100:
+            if page_description:
+                logger.warning("Warning: Received short or empty content for %s: %s", page_description, html_content[:200] if html_content else 'None')
+            return None
+        
+        # Check if content looks like HTML
+        if not html_content.lstrip().startswith('<'):
+            if page_description:
+                logger.warning("Warning: Content doesn't appear to be HTML for %s: %s", page_description, html_content[:200])
+            return None
+        
+        tree = html.fromstring(html_content.encode('utf-8', 'replace'), parser=self._html_parser)
+        # Scripts and styles never hold chapter text; remove them before any XPath walks the tree
+        etree.strip_elements(tree, 'script', 'style', with_tail=False)
+        return tree
+
     def _is_real_404_page(self, html_content: str) -> bool:
         """
         Check if the page is a real 404 error page with more precise detection.
@@ -195,46 +374,14 @@ class NovelDownloader:
         if not html_content:
             return False
             
-        content_lower = html_content.lower()
-        
-        # Check for common 404 error indicators
-        error_indicators = [
-            # Common 404 error messages
-            "page not found",
-            "not found",
-            "404 error",
-            "404 not found",
-            "the page you requested was not found",
-            "the requested page could not be found",
-            "this page does not exist",
-            "page does not exist",
-            "content not found",
-            "article not found",
-            "post not found",
-            
-            # Chinese 404 messages
-            "页面未找到",
-            "页面不存在",
-            "文章不存在",
-            "内容不存在",
-            "找不到页面",
-            "页面丢失",
-            "内容已删除",
-            "文章已删除",
-        ]
-        
-        # Check if any error indicator is present
-        for indicator in error_indicators:
-            if indicator in content_lower:
-                return True
+        # Check for common 404 error indicators in a single case-insensitive scan
+        if _NOT_FOUND_RE.search(html_content):
+            return True
         
         # Check for 404 in title tag specifically
-        import re
-        title_match = re.search(r'<title[^>]*>(.*?)</title>', content_lower, re.DOTALL)
-        if title_match:
-            title_content = title_match.group(1).strip()
-            if any(indicator in title_content for indicator in ["404", "not found", "页面未找到", "页面不存在"]):
-                return True
+        title_match = _TITLE_CONTENT_RE.search(html_content)
+        if title_match and _NOT_FOUND_TITLE_RE.search(title_match.group(1)):
+            return True
         
         # Check if page is very short (likely an error page)
         if len(html_content.strip()) < 500:
@@ -255,46 +402,26 @@ class NovelDownloader:
             True if Cloudflare protection is detected, False otherwise
         """
         try:
-            html_content = await tab.page_source
-            if not html_content or not html_content.strip().startswith('<'):
+            tree = self._parse(await tab.page_source)
+            if tree is None:
                 return False
-                
-            tree = html.fromstring(html_content)
             
             # Check for Cloudflare protection indicators in title
-            title_elements = tree.xpath("//title")
+            title_elements = _TITLE_XPATH(tree)
             if title_elements:
                 title = title_elements[0].text_content().strip()
-                protection_titles = [
-                    "请稍候",
-                    "Just a moment",
-                    "Checking your browser",
-                    "Please wait"
-                ]
-                
-                for protection_title in protection_titles:
-                    if protection_title in title:
-                        return True
+                if _CF_TITLE_RE.search(title):
+                    return True
             
             # Check for Cloudflare challenge text
-            page_text = tree.text_content().lower()
-            challenge_texts = [
-                "请完成以下操作，验证您是真人",
-                "请稍候",
-                "just a moment",
-                "checking your browser",
-                "verify you are human",
-                "complete the challenge"
-            ]
-            
-            for text in challenge_texts:
-                if text.lower() in page_text:
-                    return True
+            page_text = tree.text_content()
+            if _CF_BODY_RE.search(page_text):
+                return True
                         
             return False
             
         except Exception as e:
-            print(f"   Warning: Could not detect Cloudflare protection: {e}")
+            logger.warning("   Warning: Could not detect Cloudflare protection: %s", e)
             return False
     
     async def _attempt_cloudflare_bypass(self, tab):
@@ -313,15 +440,15 @@ class NovelDownloader:
         #     # await tab._bypass_cloudflare(event=None, custom_selector=(By.XPATH, '//p[contains(@class, "h2") and contains(@class, "spacer-bottom")]//following-sibling::div[1]//div'), time_before_click=2, time_to_wait_captcha=5)
         # except Exception as e:
         #     print(f"   ⚠️ Failed to automatically bypass Cloudflare Turnstile captcha. {e}")
-        print(f"   ⏳ Attempting to automatically bypass Cloudflare Turnstile captcha...")
+        logger.info("   ⏳ Attempting to automatically bypass Cloudflare Turnstile captcha...")
         try:
             selector = (By.XPATH, '//input[@name="cf-turnstile-response"]//parent::div')
             element = await tab.find_or_wait_element(
                 *selector, timeout=1, raise_exc=False
             )
-            print(f"   ✅ Find Cloudflare Turnstile captcha element: {element}")
+            logger.info("   ✅ Find Cloudflare Turnstile captcha element: %s", element)
             element_text = await element.text
-            print(f"   ✅ Cloudflare Turnstile captcha element text: {element_text}")
+            logger.info("   ✅ Cloudflare Turnstile captcha element text: %s", element_text)
             # print(f"   ✅ Cloudflare Turnstile captcha element type: {type(element)}")
             if element:
                 if isinstance(element, list):
@@ -331,9 +458,32 @@ class NovelDownloader:
                 await tab.execute_script('argument.style="width: 300px"', element)
                 # await asyncio.sleep(5)
                 await element.click(x_offset=-130)
-                print(f"   ✅ Click input checkbox")
+                logger.info("   ✅ Click input checkbox")
         except Exception as exc:
-            print(f"   ⚠️ Error in cloudflare bypass: {exc}")
+            logger.warning("   ⚠️ Error in cloudflare bypass: %s", exc)
+
+    def _get_page_title(self, html_content: Optional[str]) -> str:
+        """
+        Get the page title, using a cheap regex before falling back to a full parse.
+        
+        Args:
+            html_content: Page source returned by the browser
+            
+        Returns:
+            Page title, or an empty string if none was found
+        """
+        if not html_content:
+            return ""
+        
+        match = _TITLE_TAG_RE.search(html_content)
+        if match:
+            return match.group(1).strip()
+        
+        tree = self._parse(html_content)
+        if tree is None:
+            return ""
+        title_elements = _TITLE_XPATH(tree)
+        return title_elements[0].text_content().strip() if title_elements else ""
 
     async def _handle_cloudflare_protection(self, tab, page_description: str):
         """
@@ -345,57 +495,54 @@ class NovelDownloader:
         """
         max_wait_time = CLOUDFLARE_MAX_WAIT_TIME
         check_interval = CLOUDFLARE_CHECK_INTERVAL
-        waited_time = 0
+        waited_time = 0.0
+        sleep_time = 1.0  # Grows up to check_interval so quickly cleared challenges return fast
+        last_progress = None
         
         while waited_time < max_wait_time:
             try:
-                # Get page title by parsing HTML content
-                html_content = await tab.page_source
-                if html_content and html_content.strip().startswith('<'):
-                    tree = html.fromstring(html_content)
-                    title_elements = tree.xpath("//title")
-                    title = title_elements[0].text_content().strip() if title_elements else ""
-                else:
-                    title = ""
+                title = self._get_page_title(await tab.page_source)
                 
                 # Check if title indicates Cloudflare protection
-                if title and ("请稍候" in title or "Just a moment" in title or "Checking your browser" in title):
+                if title and _CF_TITLE_RE.search(title):
                     if waited_time == 0:
-                        print(f"⚠️  Cloudflare protection detected on {page_description}")
-                        print(f"   Page title: {title}")
-                        print("   🔒 Please complete the verification manually in the browser window")
-                        print("   💡 Look for:")
-                        print("      - Checkbox with 'I'm human' or 'I'm not a robot'")
-                        print("      - Turnstile challenge widget")
-                        print("      - Any verification button or challenge")
-                        print("   ⏳ The script will wait up to 2 minutes for you to complete the verification...")
+                        logger.warning("⚠️  Cloudflare protection detected on %s", page_description)
+                        logger.info("   Page title: %s", title)
+                        logger.info("   🔒 Please complete the verification manually in the browser window")
+                        logger.info("   💡 Look for:")
+                        logger.info("      - Checkbox with 'I'm human' or 'I'm not a robot'")
+                        logger.info("      - Turnstile challenge widget")
+                        logger.info("      - Any verification button or challenge")
+                        logger.info("   ⏳ The script will wait up to 2 minutes for you to complete the verification...")
                     
                     # Show progress every 15 seconds
-                    if waited_time % 15 == 0 or waited_time < 10:
-                        print(f"   ⏳ Waiting for verification... ({waited_time}s/{max_wait_time}s)")
+                    if last_progress is None or waited_time < 10 or waited_time - last_progress >= 15:
+                        logger.info("   ⏳ Waiting for verification... (%.0fs/%ss)", waited_time, max_wait_time)
+                        last_progress = waited_time
                     
-                    await asyncio.sleep(check_interval)
-                    waited_time += check_interval
+                    await asyncio.sleep(sleep_time)
+                    waited_time += sleep_time
+                    sleep_time = min(sleep_time * 1.5, check_interval)
                     
                     # Attempt automatic Cloudflare Turnstile captcha bypass
                     await self._attempt_cloudflare_bypass(tab)
                 else:
                     # Title doesn't indicate Cloudflare protection, we're good
                     if waited_time > 0:
-                        print(f"   ✅ Verification completed! Waiting for page to fully load...")
+                        logger.info("   ✅ Verification completed! Waiting for page to fully load...")
                         # 额外等待页面完全加载，特别是第一个页面
                         await asyncio.sleep(5)
                     break
                     
             except Exception as e:
-                print(f"   Warning: Could not check page title: {e}")
+                logger.warning("   Warning: Could not check page title: %s", e)
                 await asyncio.sleep(check_interval)
                 waited_time += check_interval
         
         if waited_time >= max_wait_time:
-            print(f"   ⚠️  Timeout waiting for Cloudflare verification on {page_description}")
-            print("   You may need to manually refresh the page or try again later.")
-            print("   💡 Try running the command again - sometimes Cloudflare protection is temporary")
+            logger.warning("   ⚠️  Timeout waiting for Cloudflare verification on %s", page_description)
+            logger.warning("   You may need to manually refresh the page or try again later.")
+            logger.warning("   💡 Try running the command again - sometimes Cloudflare protection is temporary")
                 
     async def get_chapter_links(self, menu_url: str) -> List[Tuple[str, str]]:
         """
@@ -412,90 +559,63 @@ class NovelDownloader:
         current_url = menu_url
         page_num = 1
         
-        print(f"Starting chapter extraction from: {menu_url}")
+        logger.info("Starting chapter extraction from: %s", menu_url)
         
-        while current_url:
-            print(f"Processing page {page_num}: {current_url}")
-            
-            # Check if we've already visited this URL (prevent infinite loops)
-            if current_url in visited_urls:
-                print(f"⚠️  URL already visited, stopping pagination: {current_url}")
-                break
-            visited_urls.add(current_url)
-            
-            # Extract chapters from current page
-            page_chapters = await self._extract_chapters_from_page(current_url)
-            if page_chapters:
-                all_chapters.extend(page_chapters)
-                print(f"Found {len(page_chapters)} chapters on page {page_num}")
-            else:
-                print(f"Warning: No chapters found on page {page_num}")
-            
-            # Check for next page if pagination is configured
-            if self.chapter_list_pagination_xpath:
-                next_url = await self._get_next_page_url(current_url)
-                if next_url and next_url != current_url:
-                    current_url = next_url
-                    page_num += 1
-                    print(f"Found next page: {current_url}")
+        # Walk the chapter list pages in a single tab
+        async with self._acquire_tab("chapter list page") as tab:
+            while current_url:
+                logger.info("Processing page %s: %s", page_num, current_url)
+                visited_urls.add(current_url)
+            
+                # Extract chapters and the next page link from current page
+                page_chapters, next_url = await self._extract_chapters_from_page(current_url, tab)
+                if page_chapters:
+                    all_chapters.extend(page_chapters)
+                    logger.info("Found %d chapters on page %s", len(page_chapters), page_num)
+                else:
+                    logger.warning("Warning: No chapters found on page %s", page_num)
+            
+                # Check for next page if pagination is configured
+                if self.chapter_list_pagination_xpath:
+                    if next_url in visited_urls:
+                        # Cyclic pagination (e.g. A -> B -> A), stop before fetching the page again
+                        logger.warning("⚠️  URL already visited, stopping pagination: %s", next_url)
+                        break
+                    elif next_url:
+                        current_url = next_url
+                        page_num += 1
+                        logger.info("Found next page: %s", current_url)
+                    else:
+                        logger.info("No more pages found, pagination complete")
+                        break
                 else:
-                    print("No more pages found, pagination complete")
+                    # No pagination configured, only process first page
                     break
-            else:
-                # No pagination configured, only process first page
-                break
         
-        print(f"Total chapters extracted: {len(all_chapters)} from {page_num} pages")
+        logger.info("Total chapters extracted: %d from %s pages", len(all_chapters), page_num)
         return all_chapters
     
-    async def _extract_chapters_from_page(self, page_url: str) -> List[Tuple[str, str]]:
+    async def _extract_chapters_from_page(self, page_url: str, tab=None) -> Tuple[List[Tuple[str, str]], Optional[str]]:
         """
-        Extract chapter links from a single page.
+        Extract chapter links and the next page URL from a single page.
         
         Args:
             page_url: URL of the page to extract chapters from
+            tab: Optional open tab to navigate instead of opening a new one
             
         Returns:
-            List of tuples (chapter_url, chapter_title)
+            Tuple of (list of (chapter_url, chapter_title), next page URL or None)
         """
-        tab = await self.browser.new_tab()
         try:
-            print(f"  Extracting chapters from: {page_url}")
-            await tab.go_to(page_url)
-            
-            # Wait a bit for the page to load
-            await asyncio.sleep(2)
-            
-            # Check for Cloudflare protection
-            await self._handle_cloudflare_protection(tab, "chapter list page")
+            logger.debug("  Extracting chapters from: %s", page_url)
+            tree = await self._fetch_and_parse(page_url, "chapter list page", load_wait=2, tab=tab)
+            if tree is None:
+                return [], None
             
-            html_content = await tab.page_source
-            
-            # Check if we got valid HTML content
-            if not html_content or len(html_content) < 100:
-                print(f"Warning: Received short or empty content: {html_content[:200] if html_content else 'None'}")
-                return []
-            
-            # Check if content looks like HTML
-            if not html_content.strip().startswith('<'):
-                # Check if it's a browser session ID (32 character hex string)
-                if len(html_content.strip()) == 32 and all(c in '0123456789ABCDEF' for c in html_content.strip().upper()):
-                    print(f"Warning: Received browser session ID instead of HTML content: {html_content}")
-                    print("This might indicate a browser communication issue. Trying again...")
-                    await asyncio.sleep(3)  # Wait longer
-                    html_content = await tab.page_source
-                    if not html_content.strip().startswith('<'):
-                        print(f"Still receiving non-HTML content: {html_content[:200]}")
-                        return []
-                else:
-                    print(f"Warning: Content doesn't appear to be HTML: {html_content[:200]}")
-                    return []
+            # Apply chapter XPath
+            chapter_elements = self._chapter_xpath(tree)
             
-            # Parse with lxml and apply XPath
-            tree = html.fromstring(html_content)
-            chapter_elements = tree.xpath(self.chapter_xpath)
-            
-            print(f"  Found {len(chapter_elements)} chapter elements with XPath: {self.chapter_xpath}")
+            logger.debug("  Found %d chapter elements with XPath: %s", len(chapter_elements), self.chapter_xpath)
             
             chapters = []
             for i, element in enumerate(chapter_elements):
@@ -506,7 +626,7 @@ class NovelDownloader:
                         title = element.text_content().strip()
                     else:
                         # Element might be a string or other type
-                        print(f"Warning: Element {i} is not an HTML element: {type(element)}")
+                        logger.debug("Warning: Element %s is not an HTML element: %s", i, type(element))
                         continue
                         
                     if href and title:
@@ -514,175 +634,101 @@ class NovelDownloader:
                         full_url = urljoin(page_url, href)
                         chapters.append((full_url, title))
                     else:
-                        print(f"Warning: Element {i} missing href or title: href='{href}', title='{title}'")
+                        logger.debug("Warning: Element %s missing href or title: href='%s', title='%s'", i, href, title)
                         
                 except Exception as e:
-                    print(f"Error processing element {i}: {e}")
+                    logger.debug("Error processing element %s: %s", i, e)
                     continue
+            
+            # Look for the next page link on the same parsed tree
+            next_url = self._find_next_page_url(tree, page_url)
                     
-            return chapters
+            return chapters, next_url
             
         except Exception as e:
-            print(f"Error extracting chapters from page: {e}")
-            return []
-        finally:
-            try:
-                await tab.close()
-            except (KeyError, Exception) as e:
-                # Tab might already be closed or session ID changed
-                print(f"Warning: Could not close tab cleanly: {e}")
-                pass
+            logger.error("Error extracting chapters from page: %s", e)
+            return [], None
     
-    async def _get_next_page_url(self, current_url: str) -> Optional[str]:
+    def _find_next_page_url(self, tree, current_url: str) -> Optional[str]:
         """
-        Get the next page URL from the current page.
+        Find the next page URL in an already parsed chapter list page.
         
         Args:
+            tree: Parsed HTML tree of the current page
             current_url: URL of the current page
             
         Returns:
             Next page URL if found, None otherwise
         """
-        if not self.chapter_list_pagination_xpath:
+        if self._chapter_list_pagination_xpath is None:
             return None
             
-        tab = await self.browser.new_tab()
-        try:
-            print(f"  Checking for next page: {current_url}")
-            await tab.go_to(current_url)
-            
-            # Wait a bit for the page to load
-            await asyncio.sleep(1)
-            
-            # Check for Cloudflare protection
-            await self._handle_cloudflare_protection(tab, "next page check")
-            
-            html_content = await tab.page_source
-            
-            # Check if we got valid HTML content
-            if not html_content or len(html_content) < 100:
-                print(f"Warning: Received short or empty content for next page check: {html_content[:200] if html_content else 'None'}")
-                return None
-            
-            # Check if content looks like HTML
-            if not html_content.strip().startswith('<'):
-                print(f"Warning: Content doesn't appear to be HTML for next page check: {html_content[:200]}")
-                return None
-            
-            # Parse with lxml and apply XPath
-            tree = html.fromstring(html_content)
-            pagination_elements = tree.xpath(self.chapter_list_pagination_xpath)
-            
-            print(f"  Found {len(pagination_elements)} pagination elements with XPath: {self.chapter_list_pagination_xpath}")
-            
-            for element in pagination_elements:
-                try:
-                    if hasattr(element, 'get'):
-                        # Element is an HTML element
-                        href = element.get('href', '')
-                        if href:
-                            # Convert relative URLs to absolute
-                            next_url = urljoin(current_url, href)
-                            if next_url != current_url:  # Make sure it's different
-                                print(f"  Found next page URL: {next_url}")
-                                return next_url
-                    else:
-                        print(f"Warning: Pagination element is not an HTML element: {type(element)}")
-                        continue
-                        
-                except Exception as e:
-                    print(f"Error processing pagination element: {e}")
-                    continue
-            
-            print("  No next page found")
-            return None
-            
-        except Exception as e:
-            print(f"Error checking for next page: {e}")
-            return None
-        finally:
-            try:
-                await tab.close()
-            except (KeyError, Exception) as e:
-                # Tab might already be closed or session ID changed
-                print(f"Warning: Could not close tab cleanly: {e}")
-                pass
+        hrefs = self._chapter_list_pagination_xpath(tree)
+        
+        logger.debug("  Found %d pagination links with XPath: %s", len(hrefs), self.chapter_list_pagination_xpath)
+        
+        for href in hrefs:
+            if href:
+                # Convert relative URLs to absolute
+                next_url = urljoin(current_url, href)
+                if next_url != current_url:  # Make sure it's different
+                    logger.debug("  Found next page URL: %s", next_url)
+                    return next_url
+        
+        logger.debug("  No next page found")
+        return None
     
-    async def get_chapter_pagination_links(self, chapter_url: str) -> List[str]:
+    def _extract_pagination_links(self, tree, chapter_url: str) -> List[str]:
         """
-        Extract pagination links from a chapter page.
+        Extract pagination links from an already parsed chapter page.
         
         Args:
+            tree: Parsed HTML tree of the chapter's first page
             chapter_url: URL of the chapter page
             
         Returns:
-            List of pagination URLs for this chapter
+            List of pagination URLs for this chapter, starting with chapter_url
         """
-        if not self.chapter_pagination_xpath:
+        if self._chapter_pagination_xpath is None:
             return [chapter_url]  # No pagination, return original URL
             
-        tab = await self.browser.new_tab()
-        try:
-            print(f"Checking for pagination in chapter: {chapter_url}")
-            await tab.go_to(chapter_url)
-            
-            # Wait for page to load
-            await asyncio.sleep(1)
-            
-            # Check for Cloudflare protection
-            await self._handle_cloudflare_protection(tab, f"chapter pagination check")
-            
-            html_content = await tab.page_source
-            
-            # Check if we got valid HTML content
-            if not html_content or len(html_content) < 100:
-                print(f"Warning: Received short or empty content for pagination check: {html_content[:200] if html_content else 'None'}")
-                return [chapter_url]
-            
-            # Check if content looks like HTML
-            if not html_content.strip().startswith('<'):
-                print(f"Warning: Content doesn't appear to be HTML for pagination check: {html_content[:200]}")
-                return [chapter_url]
-            
-            # Parse with lxml and apply XPath
-            tree = html.fromstring(html_content)
-            pagination_elements = tree.xpath(self.chapter_pagination_xpath)
-            
-            print(f"Found {len(pagination_elements)} pagination elements with XPath: {self.chapter_pagination_xpath}")
-            
-            pagination_urls = [chapter_url]  # Start with original URL
-            for element in pagination_elements:
-                try:
-                    if hasattr(element, 'get'):
-                        # Element is an HTML element
-                        href = element.get('href', '')
-                        if href and href != chapter_url:  # Avoid duplicates
-                            # Convert relative URLs to absolute
-                            full_url = urljoin(chapter_url, href)
-                            if full_url not in pagination_urls:
-                                pagination_urls.append(full_url)
-                    else:
-                        # Element might be a string or other type
-                        print(f"Warning: Pagination element is not an HTML element: {type(element)}")
-                        continue
-                        
-                except Exception as e:
-                    print(f"Error processing pagination element: {e}")
-                    continue
-            
-            print(f"Found {len(pagination_urls)} total pages for this chapter")
-            return pagination_urls
+        hrefs = self._chapter_pagination_xpath(tree)
+        
+        logger.debug("Found %d pagination links with XPath: %s", len(hrefs), self.chapter_pagination_xpath)
+        
+        pagination_urls = [chapter_url]  # Start with original URL
+        seen_urls = {chapter_url}  # Hash-based duplicate check, keeps pagination_urls in page order
+        for href in hrefs:
+            if href and href != chapter_url:  # Avoid duplicates
+                # Convert relative URLs to absolute
+                full_url = urljoin(chapter_url, href)
+                if full_url not in seen_urls:
+                    seen_urls.add(full_url)
+                    pagination_urls.append(full_url)
+        
+        logger.debug("Found %d total pages for this chapter", len(pagination_urls))
+        return pagination_urls
             
-        except Exception as e:
-            print(f"Error extracting pagination links: {e}")
-            return [chapter_url]  # Fallback to original URL
-        finally:
-            try:
-                await tab.close()
-            except (KeyError, Exception) as e:
-                print(f"Warning: Could not close tab cleanly: {e}")
-                pass
+    def _chapter_file_path(self, chapter_title: str, metadata_hash: str = None) -> Path:
+        """
+        Get the file a chapter is saved to.
+        
+        Args:
+            chapter_title: Title of the chapter
+            metadata_hash: Hash of the metadata file to organize chapters by source
             
+        Returns:
+            Path of the chapter's HTML file
+        """
+        # Sanitize filename - use only the chapter title
+        safe_title = sanitize_filename(chapter_title)
+        
+        if metadata_hash:
+            # Organized directory structure based on metadata hash
+            return chapters_dir / f"chapters_{metadata_hash}" / f"{safe_title}.html"
+        # Fallback to original behavior for backward compatibility
+        return chapters_dir / f"{safe_title}.html"
+    
     async def download_chapter(self, chapter_url: str, chapter_title: str, base_url: str, metadata_hash: str = None) -> bool:
         """
         Download a single chapter, handling pagination if configured.
@@ -696,71 +742,129 @@ class NovelDownloader:
         Returns:
             True if successful, False otherwise
         """
-        # Sanitize filename - use only the chapter title
-        safe_title = sanitize_filename(chapter_title)
-        
-        # Create organized directory structure based on metadata hash
+        chapter_file = self._chapter_file_path(chapter_title, metadata_hash)
         if metadata_hash:
             # Create subdirectory for this metadata hash
-            hash_dir = chapters_dir / f"chapters_{metadata_hash}"
-            hash_dir.mkdir(exist_ok=True)
-            chapter_file = hash_dir / f"{safe_title}.html"
-        else:
-            # Fallback to original behavior for backward compatibility
-            chapter_file = chapters_dir / f"{safe_title}.html"
+            chapter_file.parent.mkdir(exist_ok=True)
         
-        # Check if chapter already exists
-        if chapter_file.exists():
-            print(f"Skipping existing chapter: {chapter_title}")
+        # Check if chapter already exists; files only appear once fully written, so they are complete
+        if not self.force and chapter_file.exists():
+            logger.info("Skipping existing chapter: %s", chapter_title)
             return True
             
-        async with self.semaphore:
-            try:
-                print(f"Downloading chapter: {chapter_title}")
-                
+        try:
+            logger.info("Downloading chapter: %s", chapter_title)
+            logger.debug("  Downloading: %s", chapter_url)
+            
+            # Fetch every page of the chapter in one tab, one navigation after another
+            async with self._acquire_tab(chapter_title) as tab:
+                # Load the first page once - it provides both the content and the pagination links
+                tree = await self._fetch_and_parse(chapter_url, "chapter page 1", tab=tab)
+                if tree is None:
+                    logger.error("[ERROR] 章节下载失败: %s", chapter_title)
+                    return False
+            
                 # Get all pagination URLs for this chapter
-                pagination_urls = await self.get_chapter_pagination_links(chapter_url)
-                
+                pagination_urls = self._extract_pagination_links(tree, chapter_url)
+            
                 if len(pagination_urls) > 1:
-                    print(f"Found {len(pagination_urls)} pages for chapter: {chapter_title}")
+                    logger.info("Found %d pages for chapter: %s", len(pagination_urls), chapter_title)
                 else:
-                    print(f"Single page chapter: {chapter_title}")
+                    logger.info("Single page chapter: %s", chapter_title)
+            
+                # Without a content regex or replacements nothing has to see the whole chapter,
+                # so each page is encoded straight into the output buffer as it arrives
+                stream_pages = not self._content_regex_compiled and not self.string_replacements
+                buffer = bytearray(f"<h1>{chapter_title}</h1>\n<div class='chapter-content'>\n".encode('utf-8'))
                 
-                # Download content from all pages
+                # Download content from all pages, reusing the first page's tree
                 all_content = []
+                pages_found = 0
                 for i, page_url in enumerate(pagination_urls):
-                    page_content = await self._download_chapter_page(page_url, chapter_title, i + 1, len(pagination_urls))
+                    if i == 0:
+                        page_content = self._extract_content_text(tree, chapter_title, 1)
+                    else:
+                        page_content = await self._download_chapter_page(page_url, chapter_title, i + 1, len(pagination_urls), tab)
                     if page_content:
-                        all_content.append(page_content)
+                        if not stream_pages:
+                            all_content.append(page_content)
+                        else:
+                            if pages_found:
+                                buffer += b"\n\n"
+                            buffer += page_content.encode('utf-8')
+                        pages_found += 1
                     else:
-                        print(f"[ERROR] 章节下载失败: {chapter_title}")
-                        print(f"   失败页面: {i + 1}/{len(pagination_urls)}")
-                
-                if not all_content:
-                    print(f"[ERROR] 章节内容为空: {chapter_title}")
-                    print(f"[INFO] 可能原因: 页面无法访问或内容提取失败")
-                    return False
-                
-                # Combine all page content
-                combined_content = "\n\n".join(all_content)
-                
-                # Process content with regex and string replacements
-                processed_content = self._process_content(combined_content)
-                
-                # Save chapter content
-                with open(chapter_file, 'w', encoding='utf-8') as f:
-                    f.write(f"<h1>{chapter_title}</h1>\n")
-                    f.write(f"<div class='chapter-content'>\n")
-                    f.write(processed_content)
-                    f.write("</div>\n")
-                    
-                print(f"Downloaded: {chapter_title} ({len(pagination_urls)} pages)")
-                return True
-                
-            except Exception as e:
-                print(f"[ERROR] 章节下载异常: {chapter_title}")
-                print(f"   错误详情: {e}")
+                        logger.error("[ERROR] 章节下载失败: %s", chapter_title)
+                        logger.error("   失败页面: %s/%d", i + 1, len(pagination_urls))
+            
+            if not pages_found:
+                logger.error("[ERROR] 章节内容为空: %s", chapter_title)
+                logger.info("[INFO] 可能原因: 页面无法访问或内容提取失败")
                 return False
+            
+            if not stream_pages:
+                # Process the combined content with regex and string replacements
+                buffer += self._process_content("\n\n".join(all_content)).encode('utf-8')
+            buffer += b"</div>\n"
+            
+            # Save chapter content with a single write, then move it into place so an
+            # interrupted run never leaves a partial chapter that later runs would skip
+            partial_file = chapter_file.with_name(chapter_file.name + ".part")
+            partial_file.write_bytes(buffer)
+            os.replace(partial_file, chapter_file)
+                
+            logger.info("Downloaded: %s (%d pages)", chapter_title, len(pagination_urls))
+            return True
+            
+        except Exception as e:
+            logger.error("[ERROR] 章节下载异常: %s", chapter_title)
+            logger.error("   错误详情: %s", e)
+            return False
+    
+    async def download_all(self, chapters: List[Tuple], base_url: str, metadata_hash: str = None) -> Dict[str, int]:
+        """
+        Download chapters while keeping at most `concurrency` tasks alive.
+        
+        A slot is acquired before each task is created, so chapter coroutines
+        (and their browser tabs) are only spawned once a running download finishes.
+        Results are counted as each download completes.
+        
+        Args:
+            chapters: List of (url, title) or (url, title, index) tuples
+            base_url: Base URL for relative link resolution
+            metadata_hash: Hash of the metadata file to organize chapters by source
+            
+        Returns:
+            Dictionary with "downloaded" and "failed" counts
+        """
+        stats = {"downloaded": 0, "failed": 0}
+        total = len(chapters)
+        running = set()
+        
+        def on_done(task):
+            running.discard(task)
+            self.semaphore.release()
+            if task.cancelled():
+                stats["failed"] += 1
+            elif task.exception() is not None:
+                logger.error("[ERROR] Exception in download task: %s", task.exception())
+                stats["failed"] += 1
+            elif task.result() is True:
+                stats["downloaded"] += 1
+            else:
+                stats["failed"] += 1
+            logger.info("[INFO] Progress: %d/%d chapters finished", stats["downloaded"] + stats["failed"], total)
+        
+        for chapter_info in chapters:
+            chapter_url, chapter_title = chapter_info[0], chapter_info[1]
+            await self.semaphore.acquire()
+            task = asyncio.ensure_future(self.download_chapter(chapter_url, chapter_title, base_url, metadata_hash))
+            running.add(task)
+            task.add_done_callback(on_done)
+        
+        while running:
+            await asyncio.wait(running)
+        return stats
     
     async def _validate_url(self, url: str) -> tuple[bool, str]:
         """
@@ -777,146 +881,253 @@ class NovelDownloader:
             if not url or not url.startswith(('http://', 'https://')):
                 return False, "[ERROR] 无效的URL格式"
             
-            # Try to access the URL with a quick check
-            tab = await self.browser.new_tab()
-            try:
-                await tab.go_to(url)
-                await asyncio.sleep(2)  # Wait a bit longer for page to load
-                html_content = await tab.page_source
-                
-                # Check for various error conditions
-                if not html_content or len(html_content) < 50:
-                    return False, "[ERROR] 页面无法访问 - 可能网络连接问题或代理未开启"
-                
-                if "page not found" in html_content.lower() or "404" in html_content:
-                    return False, "[ERROR] 页面未找到 (404) - 章节链接可能已失效"
-                
-                if "access denied" in html_content.lower() or "forbidden" in html_content.lower():
-                    return False, "[ERROR] 访问被拒绝 - 可能需要代理或网站限制访问"
-                
-                if "timeout" in html_content.lower() or "timed out" in html_content.lower():
-                    return False, "[ERROR] 页面访问超时 - 网络连接不稳定"
-                
-                if "cloudflare" in html_content.lower() and "checking your browser" in html_content.lower():
-                    return False, "[ERROR] 页面被Cloudflare保护 - 正在验证浏览器"
-                
-                # Check if content looks like an error page
-                if len(html_content) < 200 and any(keyword in html_content.lower() for keyword in ["error", "not found", "unavailable"]):
-                    return False, "[ERROR] 页面返回错误信息 - 可能网站维护或链接失效"
-                
-                return True, ""
-                
-            finally:
-                try:
-                    await tab.close()
-                except:
-                    pass
+            if self._http is None:
+                self._http = aiohttp.ClientSession(headers={'User-Agent': _USER_AGENT}, trust_env=True)
+            
+            # Fetch only the status and the first few KB instead of rendering the page
+            proxy = self.proxy
+            if proxy and '://' not in proxy:
+                proxy = f"http://{proxy}"
+            async with self._http.get(url, headers={'Range': 'bytes=0-4095'}, proxy=proxy,
+                                      timeout=aiohttp.ClientTimeout(total=5)) as response:
+                if response.status == 404:
+                    return False, _VALIDATE_MESSAGES["notfound"]
+                body = await response.content.read(4096)
+                html_content = body.decode(response.charset or 'utf-8', errors='replace')
+                status = response.status
+            
+            # Check for various error conditions
+            if not html_content or len(html_content) < 50:
+                return False, "[ERROR] 页面无法访问 - 可能网络连接问题或代理未开启"
+            
+            match = _VALIDATE_RE.search(html_content)
+            if match:
+                return False, _VALIDATE_MESSAGES[match.lastgroup]
+            
+            if status in (401, 403):
+                return False, _VALIDATE_MESSAGES["denied"]
+            
+            # Check if content looks like an error page
+            if len(html_content) < 200 and _ERROR_HINT_RE.search(html_content):
+                return False, "[ERROR] 页面返回错误信息 - 可能网站维护或链接失效"
+            
+            return True, ""
                     
+        except asyncio.TimeoutError:
+            return False, _VALIDATE_MESSAGES["timeout"]
         except Exception as e:
             error_msg = f"[ERROR] 页面访问失败: {str(e)}"
-            if "proxy" in str(e).lower() or "connection" in str(e).lower():
+            error_lower = str(e).lower()
+            if "proxy" in error_lower or "connection" in error_lower:
                 error_msg += " - 请检查代理设置"
-            elif "timeout" in str(e).lower():
+            elif "timeout" in error_lower:
                 error_msg += " - 网络连接超时"
             return False, error_msg
 
-    async def _download_chapter_page(self, page_url: str, chapter_title: str, page_num: int, total_pages: int) -> Optional[str]:
+    @asynccontextmanager
+    async def _acquire_tab(self, description: str):
         """
-        Download content from a single page of a chapter.
+        Borrow a browser tab from the pool for a sequence of navigations.
+        
+        At most `concurrency` tabs are open at a time. Idle tabs are kept for reuse,
+        blanked when they are returned and replaced after _TAB_MAX_USES borrows.
+        
+        Args:
+            description: Description of what the tab is used for, used in messages
+            
+        Yields:
+            An open tab
+        """
+        if self._tab_pool is None:
+            self._tab_pool = asyncio.Queue()
+            self._tab_slots = asyncio.Semaphore(self.concurrency)
+        
+        await self._tab_slots.acquire()
+        try:
+            try:
+                tab = self._tab_pool.get_nowait()
+            except asyncio.QueueEmpty:
+                tab = await self.browser.new_tab()
+                self._tab_uses[id(tab)] = 0
+            try:
+                yield tab
+            finally:
+                await self._release_tab(tab, description)
+        finally:
+            self._tab_slots.release()
+    
+    async def _release_tab(self, tab, description: str):
+        """
+        Return a borrowed tab to the pool, or close it once it has been used enough.
+        
+        Args:
+            tab: Tab obtained from _acquire_tab
+            description: Description of what the tab was used for, used in messages
+        """
+        uses = self._tab_uses.pop(id(tab), 0) + 1
+        if uses < _TAB_MAX_USES:
+            try:
+                # Drop the previous page's DOM before the tab sits idle in the pool
+                await tab.go_to("about:blank")
+                self._tab_uses[id(tab)] = uses
+                self._tab_pool.put_nowait(tab)
+                return
+            except Exception as e:
+                logger.debug("Could not reset tab for %s, closing it: %s", description, e)
+        
+        try:
+            await tab.close()
+        except (KeyError, Exception) as e:
+            # Tab might already be closed or session ID changed
+            logger.warning("Warning: Could not close tab cleanly for %s: %s", description, e)
+    
+    async def _get_page_source(self, page_url: str, page_description: str, load_wait: float = 1, tab=None) -> Optional[str]:
+        """
+        Return the HTML of a page, navigating a tab to it.
         
         Args:
             page_url: URL of the page
-            chapter_title: Title of the chapter
-            page_num: Page number (1-based)
-            total_pages: Total number of pages
+            page_description: Description of the page used in messages
+            load_wait: Seconds to wait for the page to load before inspecting it
+            tab: Optional open tab to navigate; a temporary tab is used otherwise
             
         Returns:
-            Content text if successful, None otherwise
+            Page HTML if successful, None otherwise
         """
-        # Note: URL validation is skipped to avoid double page loading
-        # The page will be validated during the actual download process
-        
-        tab = await self.browser.new_tab()
         try:
-            if total_pages > 1:
-                print(f"  Downloading page {page_num}/{total_pages}: {page_url}")
+            if tab is None:
+                async with self._acquire_tab(page_description) as tab:
+                    html_content = await self._load_page(tab, page_url, page_description, load_wait)
             else:
-                print(f"  Downloading: {page_url}")
-            
-            await tab.go_to(page_url)
-            
-            # Wait for page to load
-            await asyncio.sleep(1)
-            
-            # Check for Cloudflare protection
-            await self._handle_cloudflare_protection(tab, f"chapter page {page_num}")
+                html_content = await self._load_page(tab, page_url, page_description, load_wait)
+        except Exception as e:
+            logger.error("[ERROR] 页面下载异常: %s (%s)", page_url, page_description)
+            logger.error("   错误详情: %s", e)
+            return None
+        return html_content
+    
+    async def _load_page(self, tab, page_url: str, page_description: str, load_wait: float) -> Optional[str]:
+        """
+        Navigate a tab to a page, wait out Cloudflare protection and read the HTML.
+        
+        Args:
+            tab: Open browser tab
+            page_url: URL of the page
+            page_description: Description of the page used in messages
+            load_wait: Seconds to wait for the page to load before inspecting it
             
+        Returns:
+            Page HTML as reported by the browser
+        """
+        await tab.go_to(page_url)
+        
+        # Wait for page to load
+        await asyncio.sleep(load_wait)
+        
+        # Check for Cloudflare protection
+        await self._handle_cloudflare_protection(tab, page_description)
+        
+        html_content = await tab.page_source
+        
+        # Check if it's a browser session ID (32 character hex string) instead of HTML
+        if html_content and _SESSION_ID_RE.match(html_content):
+            logger.warning("Warning: Received browser session ID instead of HTML content for %s: %s", page_description, html_content)
+            logger.warning("This might indicate a browser communication issue. Trying again...")
+            await asyncio.sleep(2)  # Wait longer
             html_content = await tab.page_source
+        
+        return html_content
+    
+    async def _fetch_and_parse(self, page_url: str, page_description: str, load_wait: float = 1, tab=None):
+        """
+        Load a page and parse the HTML.
+        
+        Args:
+            page_url: URL of the page
+            page_description: Description of the page used in messages
+            load_wait: Seconds to wait for the page to load before inspecting it
+            tab: Optional open tab to navigate; a temporary tab is used otherwise
             
-            # Check if we got valid HTML content
-            if not html_content or len(html_content) < 100:
-                print(f"[ERROR] 页面内容过短或为空")
-                print(f"   页面: {page_url}")
-                print(f"   内容预览: {html_content[:100] if html_content else '无内容'}")
-                return None
-            
-            # Parse with lxml first to get tree object
-            tree = html.fromstring(html_content)
-            
-            # Check if content looks like HTML
-            if not html_content.strip().startswith('<'):
-                # Check if it's a browser session ID (32 character hex string)
-                if len(html_content.strip()) == 32 and all(c in '0123456789ABCDEF' for c in html_content.strip().upper()):
-                    print(f"Warning: Received browser session ID instead of HTML content for page {page_num}: {html_content}")
-                    print("This might indicate a browser communication issue. Trying again...")
-                    await asyncio.sleep(2)  # Wait longer
-                    html_content = await tab.page_source
-                    if not html_content.strip().startswith('<'):
-                        print(f"Still receiving non-HTML content for page {page_num}: {html_content[:200]}")
-                        return None
-                else:
-                    print(f"Warning: Content doesn't appear to be HTML for page {page_num}: {html_content[:200]}")
-                    return None
-            
-            content_elements = tree.xpath(self.content_xpath)
-            
-            # 添加调试信息
-            print(f"  Debug: Page {page_num} content length: {len(html_content)}")
-            print(f"  Debug: XPath '{self.content_xpath}' found {len(content_elements)} elements")
+        Returns:
+            Parsed HTML tree if successful, None otherwise
+        """
+        html_content = await self._get_page_source(page_url, page_description, load_wait, tab)
+        if html_content is None:
+            return None
+        
+        tree = self._parse(html_content, page_description)
+        if tree is not None:
+            logger.debug("  Debug: %s content length: %d", page_description, len(html_content))
+        return tree
+    
+    def _extract_content_text(self, tree, chapter_title: str, page_num: int) -> Optional[str]:
+        """
+        Extract chapter content text from a parsed chapter page.
+        
+        Args:
+            tree: Parsed HTML tree of the page
+            chapter_title: Title of the chapter
+            page_num: Page number (1-based)
             
-            if not content_elements:
-                print(f"Warning: No content found for page {page_num} of chapter: {chapter_title}")
-                # 尝试查找页面中的其他可能的内容容器
-                all_divs = tree.xpath('//div[@class]')
-                print(f"  Debug: Page has {len(all_divs)} div elements with class attributes")
+        Returns:
+            Content text if found, None otherwise
+        """
+        content_elements = self._content_xpath(tree)
+        
+        # 添加调试信息
+        logger.debug("  Debug: XPath '%s' found %d elements", self.content_xpath, len(content_elements))
+        
+        if not content_elements:
+            logger.warning("Warning: No content found for page %s of chapter: %s", page_num, chapter_title)
+            # 尝试查找页面中的其他可能的内容容器 (only worth the extra XPath when debugging)
+            if logger.isEnabledFor(logging.DEBUG):
+                all_divs = _CLASSED_DIVS_XPATH(tree)
+                logger.debug("  Debug: Page has %d div elements with class attributes", len(all_divs))
                 for i, div in enumerate(all_divs[:5]):
                     class_name = div.get('class', '')
-                    print(f"    {i+1}. class='{class_name}'")
-                return None
-            
-            # Extract text content
-            content_text = ""
-            for element in content_elements:
-                if hasattr(element, 'text_content'):
-                    # Element object
-                    content_text += element.text_content() + "\n"
-                else:
-                    # Text node or other type
-                    content_text += str(element) + "\n"
-            
-            return content_text.strip()
+                    logger.debug("    %s. class='%s'", i+1, class_name)
+            return None
+        
+        # Extract text content of elements, text nodes or other results in one join
+        content_text = "\n".join(
+            element.text_content() if hasattr(element, 'text_content') else str(element)
+            for element in content_elements
+        )
+        
+        return content_text.strip()
+
+    async def _download_chapter_page(self, page_url: str, chapter_title: str, page_num: int, total_pages: int, tab=None) -> Optional[str]:
+        """
+        Download content from a single page of a chapter.
+        
+        Args:
+            page_url: URL of the page
+            chapter_title: Title of the chapter
+            page_num: Page number (1-based)
+            total_pages: Total number of pages
+            tab: Optional open tab to navigate instead of opening a new one
             
+        Returns:
+            Content text if successful, None otherwise
+        """
+        # Note: URL validation is skipped to avoid double page loading
+        # The page will be validated during the actual download process
+        
+        if total_pages > 1:
+            logger.info("  Downloading page %s/%s: %s", page_num, total_pages, page_url)
+        else:
+            logger.debug("  Downloading: %s", page_url)
+        
+        tree = await self._fetch_and_parse(page_url, f"chapter page {page_num}", tab=tab)
+        if tree is None:
+            return None
+        
+        try:
+            return self._extract_content_text(tree, chapter_title, page_num)
         except Exception as e:
-            print(f"[ERROR] 页面下载异常: {chapter_title} (第{page_num}页)")
-            print(f"   错误详情: {e}")
+            logger.error("[ERROR] 页面下载异常: %s (第%s页)", chapter_title, page_num)
+            logger.error("   错误详情: %s", e)
             return None
-        finally:
-            try:
-                await tab.close()
-            except (KeyError, Exception) as e:
-                # Tab might already be closed or session ID changed
-                print(f"Warning: Could not close tab cleanly for page {page_num}: {e}")
-                pass
                 
     async def parse_chapters(self, menu_url: str) -> List[Tuple[str, str]]:
         """
@@ -928,16 +1139,16 @@ class NovelDownloader:
         Returns:
             List of (chapter_url, chapter_title) tuples
         """
-        print(f"Parsing chapter information from: {menu_url}")
+        logger.info("Parsing chapter information from: %s", menu_url)
         
         try:
             # Get chapter links
-            print("Extracting chapter links...")
+            logger.info("Extracting chapter links...")
             chapters = await self.get_chapter_links(menu_url)
-            print(f"Found {len(chapters)} chapters")
+            logger.info("Found %d chapters", len(chapters))
             
             if not chapters:
-                print("No chapters found. Please check your XPath expressions.")
+                logger.info("No chapters found. Please check your XPath expressions.")
                 return []
             
             # Save chapter metadata
@@ -948,16 +1159,14 @@ class NovelDownloader:
             )
             
             # Show first few chapters for debugging
-            print("First 5 chapters:")
+            logger.info("First 5 chapters:")
             for i, (url, title) in enumerate(chapters[:5]):
-                print(f"  {i+1}. {title} -> {url}")
+                logger.info("  %s. %s -> %s", i+1, title, url)
                 
             return chapters
             
         except Exception as e:
-            print(f"Error in parse_chapters: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Error in parse_chapters: %s", e)
             return []
             
     async def download_novel(self, menu_url: str, force_parse: bool = False) -> Dict[str, Any]:
@@ -972,49 +1181,47 @@ class NovelDownloader:
         Returns:
             Dictionary with download statistics
         """
-        print(f"Starting novel download from: {menu_url}")
+        logger.info("Starting novel download from: %s", menu_url)
         
         try:
             chapters = []
+            # Hash the URL once; it names both the metadata file and the chapter directory
+            metadata_hash = self.metadata_manager.get_metadata_key(menu_url, self.custom_hash)
             
             # Check for stored chapter information first (unless force_parse is True)
             if not force_parse:
-                print("Checking for stored chapter information...")
-                stored_chapters = self.metadata_manager.get_stored_chapters(menu_url, self.custom_hash)
+                logger.info("Checking for stored chapter information...")
+                stored_chapters = self.metadata_manager.get_stored_chapters(menu_url, metadata_hash)
                 if stored_chapters:
-                    print(f"[SUCCESS] Found stored chapter information with {len(stored_chapters)} chapters")
+                    logger.info("[SUCCESS] Found stored chapter information with %d chapters", len(stored_chapters))
                     chapters = stored_chapters
                 else:
-                    print("[INFO] No stored chapter information found. Will parse from URL...")
+                    logger.info("[INFO] No stored chapter information found. Will parse from URL...")
             
             # If no stored chapters or force_parse is True, parse from URL
             if not chapters:
-                print("[INFO] Extracting chapter links from URL...")
+                logger.info("[INFO] Extracting chapter links from URL...")
                 chapters = await self.get_chapter_links(menu_url)
                 if chapters:
-                    print(f"[SUCCESS] Successfully parsed {len(chapters)} chapters from URL")
+                    logger.info("[SUCCESS] Successfully parsed %d chapters from URL", len(chapters))
                     # Save the parsed chapters for future use
                     self.metadata_manager.save_chapter_metadata(
                         menu_url, chapters, self.chapter_xpath, self.content_xpath, 
                         self.chapter_pagination_xpath, self.chapter_list_pagination_xpath,
-                        self.content_regex, self.string_replacements, self.custom_hash
+                        self.content_regex, self.string_replacements, metadata_hash
                     )
-                    print("[INFO] Chapter information saved for future downloads")
+                    logger.info("[INFO] Chapter information saved for future downloads")
                 else:
-                    print("[ERROR] No chapters found. Please check your XPath expressions.")
+                    logger.error("[ERROR] No chapters found. Please check your XPath expressions.")
                     return {"total": 0, "downloaded": 0, "skipped": 0, "failed": 0, "error": "No chapters found"}
             
-            print(f"[INFO] Found {len(chapters)} chapters total")
+            logger.info("[INFO] Found %d chapters total", len(chapters))
             
-            # Get metadata hash for organizing chapters
-            metadata_hash = self.metadata_manager.get_metadata_hash(menu_url, self.custom_hash)
-            if metadata_hash:
-                print(f"[INFO] Organizing chapters in directory: chapters_{metadata_hash}/")
-            else:
-                print("[INFO] No metadata hash found, using default chapters directory")
+            # The metadata file was just loaded or saved, so chapters go under its hash
+            logger.info("[INFO] Organizing chapters in directory: chapters_%s/", metadata_hash)
             
             # Show first few chapters for debugging
-            print("[INFO] First 5 chapters:")
+            logger.info("[INFO] First 5 chapters:")
             for i, chapter_info in enumerate(chapters[:5]):
                 if len(chapter_info) == 3:
                     # New format with index
@@ -1022,41 +1229,25 @@ class NovelDownloader:
                 else:
                     # Old format without index
                     url, title = chapter_info
-                print(f"  {i+1}. {title} -> {url}")
+                logger.info("  %s. %s -> %s", i+1, title, url)
+            
+            # Leave out chapters that are already on disk before any download task is created
+            pending_chapters = chapters if self.force else [
+                chapter_info for chapter_info in chapters
+                if not self._chapter_file_path(chapter_info[1], metadata_hash).exists()
+            ]
+            skipped = len(chapters) - len(pending_chapters)
+            if skipped:
+                logger.info("[INFO] Skipping %d chapters that are already downloaded", skipped)
             
             # Download chapters concurrently
-            print(f"[INFO] Starting download with {self.concurrency} concurrent connections...")
-            tasks = []
-            for chapter_info in chapters:
-                if len(chapter_info) == 3:
-                    # New format with index
-                    chapter_url, chapter_title, chapter_index = chapter_info
-                else:
-                    # Old format without index
-                    chapter_url, chapter_title = chapter_info
-                
-                task = self.download_chapter(chapter_url, chapter_title, menu_url, metadata_hash)
-                tasks.append(task)
-                
-            print("[INFO] Waiting for download tasks to complete...")
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            print("[SUCCESS] Download tasks completed")
-            
-            # Count results
-            stats = {"total": len(chapters), "downloaded": 0, "skipped": 0, "failed": 0}
-            for result in results:
-                if isinstance(result, Exception):
-                    print(f"[ERROR] Exception in download task: {result}")
-                    stats["failed"] += 1
-                elif result is True:
-                    stats["downloaded"] += 1
-                else:
-                    stats["failed"] += 1
-                    
+            logger.info("[INFO] Starting download with %s concurrent connections...", self.concurrency)
+            results = await self.download_all(pending_chapters, menu_url, metadata_hash)
+            logger.info("[SUCCESS] Download tasks completed")
+            
+            stats = {"total": len(chapters), "downloaded": results["downloaded"], "skipped": skipped, "failed": results["failed"]}
             return stats
             
         except Exception as e:
-            print(f"[ERROR] Error in download_novel: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("[ERROR] Error in download_novel: %s", e)
             return {"total": 0, "downloaded": 0, "skipped": 0, "failed": 0}
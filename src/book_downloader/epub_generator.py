@@ -4,19 +4,62 @@ EPUB generation module for Novel Downloader.
 Handles creation of EPUB files from downloaded chapters.
 """
 
-import os
 import re
 import uuid
 import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import List
+from typing import List, NamedTuple, Set, Tuple
+from xml.sax.saxutils import escape, quoteattr
+
+from lxml import etree, html
+from lxml.builder import ElementMaker
 
 from .config import temp_dir
-from .utils import extract_chapter_title, sort_chapters_by_metadata
+from .utils import sort_chapters_by_metadata
 from .metadata import find_best_metadata
 
 
+# Chapter file structure written by the downloader, compiled once for all chapters
+_H1_XP = etree.XPath('//h1')
+_CONTENT_XP = etree.XPath('//div[@class="chapter-content"]')
+
+# Characters replaced when deriving EPUB file names and XML ids from chapter titles
+_FN_RE = re.compile(r'[<>:"/\\|?*（）]')
+_ID_RE = re.compile(r'[<>:"/\\|?*]')
+
+# Line breaks (and the blank space around them) that separate paragraphs in chapter text
+_PARA_RE = re.compile(r'\s*\n\s*')
+
+# Control characters that are not allowed in XML text
+_XML_INVALID_RE = re.compile(r'[\x00-\x08\x0b\x0c\x0e-\x1f]')
+
+# Builder and fixed parts of the chapter XHTML documents
+_XHTML = ElementMaker(namespace="http://www.w3.org/1999/xhtml", nsmap={None: "http://www.w3.org/1999/xhtml"})
+_XHTML_DOCTYPE = '<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.1//EN" "http://www.w3.org/TR/xhtml11/DTD/xhtml11.dtd">'
+_CHAPTER_CSS = """
+        body { font-family: serif; margin: 20px; line-height: 1.6; }
+        h1 { font-size: 1.5em; margin: 20px 0; text-align: center; }
+        p { margin: 10px 0; text-indent: 2em; }
+    """
+
+# Threads used to prefetch chapter files while earlier chapters are parsed
+_READ_WORKERS = 4
+
+
+class ChapterRec(NamedTuple):
+    """A downloaded chapter, parsed once and shared by every EPUB part."""
+    title: str
+    safe_fn: str
+    xid: str
+    content: str
+    # XML-escaped forms, computed once for the OPF, NCX and XHTML writers
+    title_xml: str
+    xid_attr: str
+    href_attr: str
+
+
 def create_epub(output_file: str, title: str, author: str, chapter_files: List[Path], reverse: bool = False):
     """
     Create an EPUB file from chapters.
@@ -59,6 +102,7 @@ def create_epub(output_file: str, title: str, author: str, chapter_files: List[P
 </container>'''
         with open(meta_inf_dir / "container.xml", 'w', encoding='utf-8') as f:
             f.write(container_xml)
+        epub_files = [meta_inf_dir / "container.xml"]
         
         # Create OEBPS directory
         oebps_dir = temp_epub_dir / "OEBPS"
@@ -68,17 +112,17 @@ def create_epub(output_file: str, title: str, author: str, chapter_files: List[P
         with open(temp_epub_dir / "mimetype", 'w', encoding='utf-8') as f:
             f.write("application/epub+zip")
         
-        # Create content.opf
-        create_content_opf(oebps_dir, title, author, chapter_files)
+        # Read and parse every chapter once for all EPUB parts
+        chapters = _load_chapters(chapter_files)
         
-        # Create toc.ncx
-        create_toc_ncx(oebps_dir, title, chapter_files)
+        # Create content.opf and toc.ncx
+        epub_files += _build_package_files(oebps_dir, chapters, title, author)
         
         # Create chapter files
-        create_epub_chapters(oebps_dir, chapter_files, title, author)
+        epub_files += create_epub_chapters(oebps_dir, chapters, title, author)
         
         # Create EPUB file
-        create_epub_zip(output_file, temp_epub_dir)
+        create_epub_zip(output_file, temp_epub_dir, epub_files)
         
     finally:
         # Clean up temporary directory
@@ -87,91 +131,149 @@ def create_epub(output_file: str, title: str, author: str, chapter_files: List[P
             shutil.rmtree(temp_epub_dir)
 
 
-def create_content_opf(oebps_dir: Path, title: str, author: str, chapter_files: List[Path]):
-    """Create content.opf file for EPUB."""
-    manifest_items = []
-    spine_items = []
+def _element_text(elem) -> str:
+    """Return an element's text, skipping the descendant walk when it has no children."""
+    return (elem.text or '') if len(elem) == 0 else elem.text_content()
+
+
+def _unique_name(name: str, i: int, used: Set[str]) -> str:
+    """
+    Return ``name``, or a ``chapter_NNN`` name if it is empty, only underscores, or already used.
     
-    # Add cover and title page
-    manifest_items.append('    <item id="cover" href="cover.xhtml" media-type="application/xhtml+xml"/>')
-    manifest_items.append('    <item id="title" href="title.xhtml" media-type="application/xhtml+xml"/>')
-    spine_items.append('    <itemref idref="cover"/>')
-    spine_items.append('    <itemref idref="title"/>')
+    Names are compared case-insensitively so they stay distinct inside the zip on any
+    filesystem. The chosen name is added to ``used``.
+    """
+    if not name.strip('_') or name.lower() in used:
+        name = f"chapter_{i+1:03d}"
+        suffix = 2
+        while name.lower() in used:
+            name = f"chapter_{i+1:03d}_{suffix}"
+            suffix += 1
+    used.add(name.lower())
+    return name
+
+
+def _safe_names(chapter_title: str, i: int, used_filenames: Set[str], used_ids: Set[str]) -> Tuple[str, str]:
+    """
+    Derive the EPUB file name and XML id for a chapter.
     
-    # Add chapters
-    for i, chapter_file in enumerate(chapter_files):
-        chapter_title = extract_chapter_title(chapter_file)
-        # Create a safe filename from chapter title
-        safe_filename = re.sub(r'[<>:"/\\|?*（）]', '_', chapter_title)
-        safe_filename = safe_filename.replace(' ', '_')[:50]  # Limit length
-        # Ensure filename is ASCII safe
-        safe_filename = safe_filename.encode('ascii', 'ignore').decode('ascii')
-        if not safe_filename:
-            safe_filename = f"chapter_{i+1:03d}"
+    Args:
+        chapter_title: Title of the chapter
+        i: Zero-based position of the chapter in the book
+        used_filenames: Lowercased file names already taken; updated in place
+        used_ids: Lowercased XML ids already taken; updated in place
         
-        # Create XML-safe ID from chapter title (keep Chinese characters but make XML safe)
-        xml_safe_id = re.sub(r'[<>:"/\\|?*]', '_', chapter_title)
-        xml_safe_id = xml_safe_id.replace(' ', '_')[:50]  # Limit length
-        if not xml_safe_id:
-            xml_safe_id = f"chapter_{i+1:03d}"
+    Returns:
+        Tuple of (ASCII-safe file name without extension, XML-safe id), each unique in the book
+    """
+    # Create a safe filename from chapter title, limited in length and ASCII only
+    safe_filename = _FN_RE.sub('_', chapter_title).replace(' ', '_')[:50]
+    safe_filename = safe_filename.encode('ascii', 'ignore').decode('ascii')
+    
+    # Create XML-safe ID from chapter title (keep Chinese characters but make XML safe)
+    xml_safe_id = _ID_RE.sub('_', chapter_title).replace(' ', '_')[:50]
+    
+    return _unique_name(safe_filename, i, used_filenames), _unique_name(xml_safe_id, i, used_ids)
+
+
+def _load_chapters(chapter_files: List[Path]) -> List[ChapterRec]:
+    """
+    Read and parse downloaded chapter files for the EPUB.
+    
+    Args:
+        chapter_files: Chapter file paths in book order
+        
+    Returns:
+        List of ChapterRec in the same order
+    """
+    chapters = []
+    # Chapter names must not collide with the fixed pages or ids in the package
+    used_filenames = {"cover", "title"}
+    used_ids = {"cover", "title", "ncx", "book-id"}
+    # Read the next chapters from disk in background threads while the current one is parsed
+    with ThreadPoolExecutor(max_workers=_READ_WORKERS) as pool:
+        for i, (chapter_file, data) in enumerate(zip(chapter_files, pool.map(Path.read_bytes, chapter_files))):
+            print(f"Creating EPUB chapter: {chapter_file.name}")
+            tree = html.fromstring(data.decode('utf-8'))
+            
+            # Extract title and content
+            title_elems = _H1_XP(tree)
+            content_elems = _CONTENT_XP(tree)
+            
+            chapter_title = _element_text(title_elems[0]).strip() if len(title_elems) > 0 else chapter_file.stem
+            chapter_content = content_elems[0].text_content().strip() if len(content_elems) > 0 else tree.text_content().strip()
+            
+            safe_filename, xml_safe_id = _safe_names(chapter_title, i, used_filenames, used_ids)
+            chapters.append(ChapterRec(
+                chapter_title, safe_filename, xml_safe_id, chapter_content,
+                escape(chapter_title), quoteattr(xml_safe_id), quoteattr(f"{safe_filename}.xhtml"),
+            ))
+    return chapters
+
+
+def _build_package_files(oebps_dir: Path, chapters: List[ChapterRec], title: str, author: str) -> List[Path]:
+    """
+    Create content.opf and toc.ncx for EPUB from a single pass over the chapters.
+    
+    Args:
+        oebps_dir: OEBPS directory inside the EPUB staging tree
+        chapters: Parsed chapters in book order
+        title: Title for the novel
+        author: Author name
         
-        chapter_href = f"{safe_filename}.xhtml"
-        manifest_items.append(f'    <item id="{xml_safe_id}" href="{chapter_href}" media-type="application/xhtml+xml"/>')
-        spine_items.append(f'    <itemref idref="{xml_safe_id}"/>')
+    Returns:
+        Paths of the files written
+    """
+    title = escape(title)
     
-    content_opf = f'''<?xml version="1.0" encoding="UTF-8"?>
+    # Collect manifest, spine and navigation entries together
+    manifest_items = []
+    spine_items = []
+    nav_points = []
+    for i, chapter in enumerate(chapters):
+        manifest_items.append(
+            f'    <item id={chapter.xid_attr} href={chapter.href_attr} media-type="application/xhtml+xml"/>\n'
+        )
+        spine_items.append(f'    <itemref idref={chapter.xid_attr}/>\n')
+        nav_points.append(f'''        <navPoint id={chapter.xid_attr} playOrder="{i+2}">
+            <navLabel><text>{chapter.title_xml}</text></navLabel>
+            <content src={chapter.href_attr}/>
+        </navPoint>
+''')
+    
+    # Create content.opf
+    with open(oebps_dir / "content.opf", 'w', encoding='utf-8') as f:
+        f.write(f'''<?xml version="1.0" encoding="UTF-8"?>
 <package xmlns="http://www.idpf.org/2007/opf" unique-identifier="book-id" version="2.0">
     <metadata xmlns:dc="http://purl.org/dc/elements/1.1/" xmlns:opf="http://www.idpf.org/2007/opf">
         <dc:title>{title}</dc:title>
-        <dc:creator opf:file-as="{author}" opf:role="aut">{author}</dc:creator>
+        <dc:creator opf:file-as={quoteattr(author)} opf:role="aut">{escape(author)}</dc:creator>
         <dc:language>zh-CN</dc:language>
         <dc:identifier id="book-id" opf:scheme="UUID">urn:uuid:{uuid.uuid4().hex}</dc:identifier>
         <dc:date>{datetime.now().strftime('%Y-%m-%d')}</dc:date>
         <meta name="generator" content="Novel Downloader"/>
     </metadata>
     <manifest>
-{chr(10).join(manifest_items)}
-    </manifest>
+    <item id="cover" href="cover.xhtml" media-type="application/xhtml+xml"/>
+    <item id="title" href="title.xhtml" media-type="application/xhtml+xml"/>
+''')
+        f.writelines(manifest_items)
+        f.write('''    </manifest>
     <spine toc="ncx">
-{chr(10).join(spine_items)}
-    </spine>
+    <itemref idref="cover"/>
+    <itemref idref="title"/>
+''')
+        f.writelines(spine_items)
+        f.write('''    </spine>
     <guide>
         <reference type="cover" title="Cover" href="cover.xhtml"/>
         <reference type="text" title="Start" href="title.xhtml"/>
     </guide>
-</package>'''
-    
-    with open(oebps_dir / "content.opf", 'w', encoding='utf-8') as f:
-        f.write(content_opf)
-
-
-def create_toc_ncx(oebps_dir: Path, title: str, chapter_files: List[Path]):
-    """Create toc.ncx file for EPUB."""
-    nav_points = []
-    
-    for i, chapter_file in enumerate(chapter_files):
-        # Extract actual chapter title from HTML file
-        chapter_title = extract_chapter_title(chapter_file)
-        # Create a safe filename from chapter title
-        safe_filename = re.sub(r'[<>:"/\\|?*（）]', '_', chapter_title)
-        safe_filename = safe_filename.replace(' ', '_')[:50]  # Limit length
-        # Ensure filename is ASCII safe
-        safe_filename = safe_filename.encode('ascii', 'ignore').decode('ascii')
-        if not safe_filename:
-            safe_filename = f"chapter_{i+1:03d}"
-        
-        # Create XML-safe ID from chapter title (keep Chinese characters but make XML safe)
-        xml_safe_id = re.sub(r'[<>:"/\\|?*]', '_', chapter_title)
-        xml_safe_id = xml_safe_id.replace(' ', '_')[:50]  # Limit length
-        if not xml_safe_id:
-            xml_safe_id = f"chapter_{i+1:03d}"
-        
-        nav_points.append(f'''        <navPoint id="{xml_safe_id}" playOrder="{i+2}">
-            <navLabel><text>{chapter_title}</text></navLabel>
-            <content src="{safe_filename}.xhtml"/>
-        </navPoint>''')
+</package>''')
     
-    toc_ncx = f'''<?xml version="1.0" encoding="UTF-8"?>
+    # Create toc.ncx
+    with open(oebps_dir / "toc.ncx", 'w', encoding='utf-8') as f:
+        f.write(f'''<?xml version="1.0" encoding="UTF-8"?>
 <!DOCTYPE ncx PUBLIC "-//NISO//DTD ncx 2005-1//EN" "http://www.daisy.org/z3986/2005/ncx-2005-1.dtd">
 <ncx xmlns="http://www.daisy.org/z3986/2005/" version="2005-1">
     <head>
@@ -188,16 +290,18 @@ def create_toc_ncx(oebps_dir: Path, title: str, chapter_files: List[Path]):
             <navLabel><text>Title Page</text></navLabel>
             <content src="title.xhtml"/>
         </navPoint>
-{chr(10).join(nav_points)}
-    </navMap>
-</ncx>'''
+''')
+        f.writelines(nav_points)
+        f.write('''    </navMap>
+</ncx>''')
     
-    with open(oebps_dir / "toc.ncx", 'w', encoding='utf-8') as f:
-        f.write(toc_ncx)
+    return [oebps_dir / "content.opf", oebps_dir / "toc.ncx"]
 
 
-def create_epub_chapters(oebps_dir: Path, chapter_files: List[Path], title: str, author: str):
-    """Create XHTML chapter files for EPUB."""
+def create_epub_chapters(oebps_dir: Path, chapters: List[ChapterRec], title: str, author: str) -> List[Path]:
+    """Create XHTML chapter files for EPUB and return the paths written."""
+    title = escape(title)
+    author = escape(author)
     # Create cover page
     cover_xhtml = '''<?xml version="1.0" encoding="UTF-8"?>
 <!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.1//EN" "http://www.w3.org/TR/xhtml11/DTD/xhtml11.dtd">
@@ -246,65 +350,54 @@ def create_epub_chapters(oebps_dir: Path, chapter_files: List[Path], title: str,
         f.write(title_xhtml)
     
     # Create chapter files
-    for i, chapter_file in enumerate(chapter_files):
-        print(f"Creating EPUB chapter: {chapter_file.name}")
-        
-        with open(chapter_file, 'r', encoding='utf-8') as infile:
-            content = infile.read()
-        
-        # Convert HTML to XHTML for EPUB
-        from lxml import html
-        tree = html.fromstring(content)
-        
-        # Extract title and content
-        title_elems = tree.xpath('//h1')
-        content_elems = tree.xpath('//div[@class="chapter-content"]')
-        
-        chapter_title = title_elems[0].text_content().strip() if len(title_elems) > 0 else chapter_file.stem
-        chapter_content = content_elems[0].text_content().strip() if len(content_elems) > 0 else tree.text_content().strip()
-        
-        # Create a safe filename from chapter title
-        safe_filename = re.sub(r'[<>:"/\\|?*（）]', '_', chapter_title)
-        safe_filename = safe_filename.replace(' ', '_')[:50]  # Limit length
-        # Ensure filename is ASCII safe
-        safe_filename = safe_filename.encode('ascii', 'ignore').decode('ascii')
-        if not safe_filename:
-            safe_filename = f"chapter_{i+1:03d}"
-        
-        # Create XHTML chapter
-        chapter_xhtml = f'''<?xml version="1.0" encoding="UTF-8"?>
-<!DOCTYPE html PUBLIC "-//W3C//DTD XHTML 1.1//EN" "http://www.w3.org/TR/xhtml11/DTD/xhtml11.dtd">
-<html xmlns="http://www.w3.org/1999/xhtml">
-<head>
-    <title>{chapter_title}</title>
-    <style type="text/css">
-        body {{ font-family: serif; margin: 20px; line-height: 1.6; }}
-        h1 {{ font-size: 1.5em; margin: 20px 0; text-align: center; }}
-        p {{ margin: 10px 0; text-indent: 2em; }}
-    </style>
-</head>
-<body>
-    <h1>{chapter_title}</h1>
-    <div class="chapter-content">
-        {chapter_content.replace(chr(10), '<br/>')}
-    </div>
-</body>
-</html>'''
-        
-        with open(oebps_dir / f"{safe_filename}.xhtml", 'w', encoding='utf-8') as f:
-            f.write(chapter_xhtml)
+    written = [oebps_dir / "cover.xhtml", oebps_dir / "title.xhtml"]
+    for chapter in chapters:
+        written.append(_write_epub_chapter(oebps_dir, chapter))
+    return written
+
+
+def _write_epub_chapter(oebps_dir: Path, chapter: ChapterRec) -> Path:
+    """Write one chapter as an XHTML file in the EPUB and return its path."""
+    chapter_title = _XML_INVALID_RE.sub('', chapter.title)
+    chapter_content = _XML_INVALID_RE.sub('', chapter.content)
+    
+    # Build the XHTML tree and let lxml escape and serialize it;
+    # one <p> per line of text, the stylesheet already indents paragraphs
+    doc = _XHTML.html(
+        _XHTML.head(
+            _XHTML.title(chapter_title),
+            _XHTML.style(_CHAPTER_CSS, type="text/css"),
+        ),
+        _XHTML.body(
+            _XHTML.h1(chapter_title),
+            _XHTML.div(
+                *[_XHTML.p(line) for line in _PARA_RE.split(chapter_content) if line],
+                **{"class": "chapter-content"}
+            ),
+        ),
+    )
+    
+    chapter_path = oebps_dir / f"{chapter.safe_fn}.xhtml"
+    chapter_path.write_bytes(etree.tostring(
+        doc, pretty_print=True, xml_declaration=True, encoding='utf-8', doctype=_XHTML_DOCTYPE,
+    ))
+    return chapter_path
 
 
-def create_epub_zip(output_file: str, temp_dir: Path):
-    """Create the final EPUB ZIP file."""
-    with zipfile.ZipFile(output_file, 'w', zipfile.ZIP_DEFLATED) as epub_zip:
+def create_epub_zip(output_file: str, temp_dir: Path, files: List[Path]):
+    """
+    Create the final EPUB ZIP file.
+    
+    Args:
+        output_file: Output filename for the EPUB
+        temp_dir: Staging directory the archive paths are relative to
+        files: Files written while generating the EPUB, excluding mimetype
+    """
+    # Fastest deflate level: XHTML still shrinks well and chapters compress several times faster
+    with zipfile.ZipFile(output_file, 'w', zipfile.ZIP_DEFLATED, compresslevel=1) as epub_zip:
         # Add mimetype file first (uncompressed)
         epub_zip.write(temp_dir / "mimetype", "mimetype", compress_type=zipfile.ZIP_STORED)
         
-        # Add all other files
-        for root, dirs, files in os.walk(temp_dir):
-            for file in files:
-                if file != "mimetype":  # Skip mimetype as it's already added
-                    file_path = Path(root) / file
-                    arc_path = file_path.relative_to(temp_dir)
-                    epub_zip.write(file_path, arc_path)
+        # Add the generated files directly instead of walking the staging directory
+        for file_path in files:
+            epub_zip.write(file_path, file_path.relative_to(temp_dir))
@@ -6,11 +6,128 @@ Handles chapter metadata storage, loading, and management.
 
 import json
 import hashlib
+import os
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Tuple, Optional, Dict, Any
+from typing import List, Tuple, Optional, Dict, Any, TypedDict, Union
 
-from .config import metadata_dir
+from .config import metadata_dir, PRETTY_METADATA
+
+try:
+    # Optional faster JSON codec (pip install "web-novel-downloader[fast]")
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    # Also picked up when installed; used if msgspec is not available
+    import orjson
+except ImportError:
+    orjson = None
+
+# Errors raised for malformed metadata by whichever JSON codec is in use
+# (orjson.JSONDecodeError is a subclass of json.JSONDecodeError)
+_JSON_DECODE_ERRORS = (json.JSONDecodeError,) if msgspec is None else (json.JSONDecodeError, msgspec.DecodeError)
+
+# Chapter entries encoded per write when streaming metadata to disk
+_STREAM_BATCH = 1024
+
+
+class _ChapterEntry(TypedDict):
+    """Keys every chapter entry in a metadata file must have."""
+    index: Any
+    title: Any
+    url: Any
+
+
+def _valid_chapter_entries(chapters: List[Any]) -> bool:
+    """Check that every chapter entry is a dict with index, title and url keys."""
+    if msgspec is not None:
+        # Validate the whole list in C instead of a Python-level loop
+        try:
+            msgspec.convert(chapters, List[_ChapterEntry])
+        except msgspec.ValidationError:
+            return False
+        return True
+    return all(
+        isinstance(chapter, dict) and "index" in chapter and "title" in chapter and "url" in chapter
+        for chapter in chapters
+    )
+
+
+def _json_loads(data: Union[bytes, str]) -> Any:
+    """Decode JSON bytes or text, with msgspec or orjson when one is installed."""
+    if msgspec is not None:
+        return msgspec.json.decode(data)
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(obj: Any, indent: bool = False) -> bytes:
+    """
+    Encode an object as UTF-8 JSON, with msgspec or orjson when one is installed.
+    
+    Args:
+        obj: Object to encode
+        indent: Whether to pretty-print with two-space indentation instead of compact output
+        
+    Returns:
+        Encoded JSON bytes
+    """
+    if msgspec is not None:
+        data = msgspec.json.encode(obj)
+        return msgspec.json.format(data, indent=2) if indent else data
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    if indent:
+        return json.dumps(obj, ensure_ascii=False, indent=2).encode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def _chapter_entries(chapters: List[Tuple[str, str]], start: int = 0) -> List[Dict[str, Any]]:
+    """Build the stored ``{"index", "url", "title"}`` entries, numbered from ``start + 1``."""
+    return [
+        {"index": i + 1, "url": url, "title": title}
+        for i, (url, title) in enumerate(chapters, start)
+    ]
+
+
+def _stream_write(path: Path, header: Dict[str, Any], chapters: List[Tuple[str, str]]) -> None:
+    """
+    Write a metadata document, encoding the chapter list in batches.
+    
+    The compact output is byte-identical to encoding the whole document at
+    once, but never holds more than one batch of chapter entries in memory.
+    
+    Args:
+        path: File to write
+        header: Metadata fields that precede the ``chapters`` key
+        chapters: List of (url, title) tuples
+    """
+    with open(path, 'wb') as f:
+        if PRETTY_METADATA:
+            # Indented output is for inspection only; encode it in one piece
+            f.write(_json_dumps({**header, "chapters": _chapter_entries(chapters)}, True))
+            return
+        f.write(_json_dumps(header)[:-1])
+        f.write(b',"chapters":[')
+        for start in range(0, len(chapters), _STREAM_BATCH):
+            if start:
+                f.write(b',')
+            batch = _chapter_entries(chapters[start:start + _STREAM_BATCH], start)
+            f.write(_json_dumps(batch)[1:-1])
+        f.write(b']}')
+
+
+# MD5 is kept on purpose: the hash is part of metadata file and chapter directory names
+# already on disk, and memoizing it leaves nothing measurable to gain from a faster hash.
+@lru_cache(maxsize=64)
+def _hash_url(menu_url: str) -> str:
+    """Short MD5 hash of a menu URL, used to name its metadata file and chapter directory."""
+    # The first 4 digest bytes are exactly the 8 hex characters the names have always used
+    return hashlib.md5(menu_url.encode('utf-8')).digest()[:4].hex()
 
 
 class MetadataManager:
@@ -18,16 +135,34 @@ class MetadataManager:
     
     def __init__(self):
         self.metadata_dir = metadata_dir
+        # Metadata file paths already derived, keyed by (menu_url, custom_hash)
+        self._path_cache: Dict[Tuple[str, Optional[str]], Path] = {}
+    
+    def get_metadata_key(self, menu_url: str, custom_hash: Optional[str] = None) -> str:
+        """
+        Get the hash that names a menu URL's metadata file.
+        
+        Args:
+            menu_url: URL of the novel's menu page
+            custom_hash: Optional custom hash, used as-is when given
+            
+        Returns:
+            Custom hash if provided, otherwise a hash of the URL
+        """
+        return custom_hash or _hash_url(menu_url)
     
     def _generate_metadata_filename(self, menu_url: str, custom_hash: Optional[str] = None) -> str:
         """Generate a unique filename for storing chapter metadata."""
-        if custom_hash:
-            # Use custom hash if provided
-            return f"chapters_{custom_hash}.json"
-        else:
-            # Create a hash of the URL for consistent filename
-            url_hash = hashlib.md5(menu_url.encode('utf-8')).hexdigest()[:8]
-            return f"chapters_{url_hash}.json"
+        return f"chapters_{self.get_metadata_key(menu_url, custom_hash)}.json"
+    
+    def _metadata_path(self, menu_url: str, custom_hash: Optional[str] = None) -> Path:
+        """Path of the metadata file for a menu URL, derived once per URL and hash."""
+        key = (menu_url, custom_hash)
+        metadata_file = self._path_cache.get(key)
+        if metadata_file is None:
+            metadata_file = self.metadata_dir / self._generate_metadata_filename(menu_url, custom_hash)
+            self._path_cache[key] = metadata_file
+        return metadata_file
     
     def _extract_hash_from_filename(self, filename: str) -> str:
         """Extract hash from metadata filename."""
@@ -47,11 +182,10 @@ class MetadataManager:
         Returns:
             Hash string if metadata file exists, None otherwise
         """
-        filename = self._generate_metadata_filename(menu_url, custom_hash)
-        metadata_file = self.metadata_dir / filename
+        metadata_file = self._metadata_path(menu_url, custom_hash)
         
         if metadata_file.exists():
-            return self._extract_hash_from_filename(filename)
+            return self._extract_hash_from_filename(metadata_file.name)
         return None
         
     def save_chapter_metadata(self, menu_url: str, chapters: List[Tuple[str, str]], 
@@ -88,17 +222,14 @@ class MetadataManager:
             "content_regex": content_regex,
             "string_replacements": string_replacements or [],
             "chapter_count": len(chapters),
-            "chapters": [
-                {"index": i + 1, "url": url, "title": title} 
-                for i, (url, title) in enumerate(chapters)
-            ]
         }
         
-        filename = self._generate_metadata_filename(menu_url, custom_hash)
-        metadata_file = self.metadata_dir / filename
+        metadata_file = self._metadata_path(menu_url, custom_hash)
         
-        with open(metadata_file, 'w', encoding='utf-8') as f:
-            json.dump(metadata, f, ensure_ascii=False, indent=2)
+        # Write next to the target and swap it in, so an interrupted save never leaves a truncated file
+        partial_file = metadata_file.with_name(metadata_file.name + ".tmp")
+        _stream_write(partial_file, metadata, chapters)
+        os.replace(partial_file, metadata_file)
             
         print(f"Chapter metadata saved to: {metadata_file}")
         return str(metadata_file)
@@ -114,15 +245,13 @@ class MetadataManager:
         Returns:
             Dictionary with chapter metadata if found, None otherwise
         """
-        filename = self._generate_metadata_filename(menu_url, custom_hash)
-        metadata_file = self.metadata_dir / filename
+        metadata_file = self._metadata_path(menu_url, custom_hash)
         
         if not metadata_file.exists():
             return None
             
         try:
-            with open(metadata_file, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
+            metadata = _json_loads(metadata_file.read_bytes())
                 
             # Verify the metadata is for the same URL
             if metadata.get("menu_url") != menu_url:
@@ -133,7 +262,7 @@ class MetadataManager:
                 
             return metadata
             
-        except (json.JSONDecodeError, KeyError) as e:
+        except (*_JSON_DECODE_ERRORS, KeyError) as e:
             print(f"Warning: Invalid metadata file format: {e}")
             return None
     
@@ -152,25 +281,42 @@ class MetadataManager:
         if metadata is None:
             return None
             
-        chapters = []
-        for chapter_info in metadata.get("chapters", []):
-            chapters.append((chapter_info["url"], chapter_info["title"], chapter_info.get("index", 0)))
-            
-        return chapters
+        # The on-disk layout stays one {index, url, title} object per chapter: merge, EPUB
+        # generation and users' existing files all read it, so only the tuples are built here
+        return [
+            (chapter_info["url"], chapter_info["title"], chapter_info.get("index", 0))
+            for chapter_info in metadata.get("chapters", [])
+        ]
 
 
-def find_metadata_files() -> List[Path]:
+def _scan_metadata_files() -> List[Tuple[Path, float]]:
     """
-    Find all metadata JSON files in the metadata directory.
+    List metadata JSON files together with their modification times.
+    
+    A single directory scan supplies both, so no file is stat'ed a second time.
     
     Returns:
-        List of metadata file paths
+        List of (metadata file path, mtime) tuples
     """
     if not metadata_dir.exists():
         return []
     
-    metadata_files = list(metadata_dir.glob("*.json"))
-    return metadata_files
+    with os.scandir(metadata_dir) as entries:
+        return [
+            (Path(entry.path), entry.stat().st_mtime)
+            for entry in entries
+            if entry.name.endswith(".json") and entry.is_file()
+        ]
+
+
+def find_metadata_files() -> List[Path]:
+    """
+    Find all metadata JSON files in the metadata directory.
+    
+    Returns:
+        List of metadata file paths
+    """
+    return [metadata_file for metadata_file, _ in _scan_metadata_files()]
 
 
 def load_metadata_from_file(metadata_file: Path) -> Optional[Dict[str, Any]]:
@@ -184,8 +330,7 @@ def load_metadata_from_file(metadata_file: Path) -> Optional[Dict[str, Any]]:
         Dictionary with chapter metadata if valid, None otherwise
     """
     try:
-        with open(metadata_file, 'r', encoding='utf-8') as f:
-            metadata = json.load(f)
+        metadata = _json_loads(metadata_file.read_bytes())
         
         # Validate metadata structure
         if not isinstance(metadata, dict):
@@ -195,15 +340,12 @@ def load_metadata_from_file(metadata_file: Path) -> Optional[Dict[str, Any]]:
             return None
             
         # Check if chapters have required fields
-        for chapter in metadata["chapters"]:
-            if not isinstance(chapter, dict):
-                return None
-            if "index" not in chapter or "title" not in chapter or "url" not in chapter:
-                return None
+        if not _valid_chapter_entries(metadata["chapters"]):
+            return None
                 
         return metadata
         
-    except (json.JSONDecodeError, KeyError, FileNotFoundError) as e:
+    except (*_JSON_DECODE_ERRORS, KeyError, FileNotFoundError) as e:
         print(f"Warning: Could not load metadata from {metadata_file.name}: {e}")
         return None
 
@@ -215,32 +357,31 @@ def find_best_metadata() -> Optional[Dict[str, Any]]:
     Returns:
         The most recent valid metadata file, or None if none found
     """
-    metadata_files = find_metadata_files()
+    metadata_files = _scan_metadata_files()
     
     if not metadata_files:
         print("No metadata files found in chapters/metadata/ directory.")
         print("Please run the 'parse' command first to generate chapter metadata.")
         return None
     
-    # Try to load each metadata file and find the best one
-    valid_metadata = []
-    for metadata_file in metadata_files:
+    # Most recent first; only files up to the first valid one need to be loaded
+    metadata_files.sort(key=lambda item: item[1], reverse=True)
+    
+    best_metadata = None
+    for metadata_file, mtime in metadata_files:
         metadata = load_metadata_from_file(metadata_file)
         if metadata:
-            # Add file modification time for sorting
+            # Add file modification time (from the directory scan)
             metadata['_file_path'] = metadata_file
-            metadata['_file_mtime'] = metadata_file.stat().st_mtime
-            valid_metadata.append(metadata)
+            metadata['_file_mtime'] = mtime
+            best_metadata = metadata
+            break
     
-    if not valid_metadata:
+    if best_metadata is None:
         print("No valid metadata files found in chapters/metadata/ directory.")
         print("Please ensure you have run the 'parse' command first.")
         return None
     
-    # Sort by modification time (most recent first)
-    valid_metadata.sort(key=lambda x: x['_file_mtime'], reverse=True)
-    
-    best_metadata = valid_metadata[0]
     print(f"Using metadata file: {best_metadata['_file_path'].name}")
     print(f"Found {len(best_metadata['chapters'])} chapters in metadata")
     
@@ -5,12 +5,17 @@ Executes complete workflow from configuration file.
 """
 
 import asyncio
-import json
+import logging
 import os
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
+from .cli import merge_chapters, replace_chapter_strings
 from .config_manager import ConfigManager
+from .core import NovelDownloader
+from .metadata import _json_loads
+
+logger = logging.getLogger(__name__)
 
 
 class TaskExecutor:
@@ -18,6 +23,59 @@ class TaskExecutor:
     
     def __init__(self):
         self.config_manager = ConfigManager()
+        # Decoded metadata files keyed by (path, mtime), so each version is parsed once
+        self._meta_cache: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        # One downloader (and browser) shared by the parse and download steps
+        self._downloader: Optional[NovelDownloader] = None
+    
+    async def _get_downloader(self, config_data: Dict[str, Any], **settings) -> NovelDownloader:
+        """
+        Get the task's downloader with the given settings, starting the browser on first use.
+        
+        Args:
+            config_data: Configuration data dictionary
+            **settings: Extraction and download settings for the current step
+            
+        Returns:
+            Downloader with a running browser
+        """
+        if self._downloader is not None:
+            self._downloader.reconfigure(**settings)
+            return self._downloader
+        
+        downloader = NovelDownloader(
+            proxy=config_data["browser"].get("proxy"),
+            headless=config_data["browser"].get("headless", True),
+            custom_hash=config_data["parsing"].get("hash"),  # Use the hash from configuration
+            chrome_path=config_data["browser"].get("chrome_path"),
+            **settings
+        )
+        await downloader.start_browser()
+        self._downloader = downloader
+        return downloader
+    
+    async def _close_downloader(self):
+        """Stop the shared browser, if one was started."""
+        if self._downloader is not None:
+            downloader, self._downloader = self._downloader, None
+            await downloader.stop_browser()
+    
+    def _load_metadata(self, metadata_file: str) -> Dict[str, Any]:
+        """
+        Load a metadata file, reusing the decoded result while the file is unchanged.
+        
+        Args:
+            metadata_file: Path to the metadata JSON file
+            
+        Returns:
+            Decoded metadata dictionary
+        """
+        key = (metadata_file, os.stat(metadata_file).st_mtime_ns)
+        metadata = self._meta_cache.get(key)
+        if metadata is None:
+            metadata = _json_loads(Path(metadata_file).read_bytes())
+            self._meta_cache[key] = metadata
+        return metadata
     
     async def execute_task(self, config_path: str) -> Dict[str, Any]:
         """
@@ -29,17 +87,17 @@ class TaskExecutor:
         Returns:
             Dictionary with execution results and statistics
         """
-        print(f"[START] Starting task execution with config: {config_path}")
+        logger.info("[START] Starting task execution with config: %s", config_path)
         
         try:
             # Load and validate configuration
-            print("[INFO] Loading configuration...")
+            logger.info("[INFO] Loading configuration...")
             config_data = self.config_manager.load_config(config_path)
-            print(f"[SUCCESS] Configuration loaded: {config_data.get('task_name', 'Unknown Task')}")
+            logger.info("[SUCCESS] Configuration loaded: %s", config_data.get('task_name', 'Unknown Task'))
             
             # Get metadata file path
             metadata_file = self.config_manager.get_metadata_file_path(config_data)
-            print(f"[INFO] Metadata file: {metadata_file}")
+            logger.info("[INFO] Metadata file: %s", metadata_file)
             
             # Execute workflow steps
             results = {
@@ -49,121 +107,98 @@ class TaskExecutor:
                 "steps": {}
             }
             
-            # Step 1: Parse chapters (skip if metadata file already exists)
-            print("\n[STEP 1] Parsing chapters...")
-            
-            # Check if metadata file already exists
-            if Path(metadata_file).exists():
-                print(f"[INFO] Metadata file already exists: {metadata_file}")
-                print("[INFO] Skipping parse step, using existing metadata...")
+            # Run the workflow steps in order, stopping at the first failure
+            steps = (
+                ("parse", "Parsing chapters", self._run_parse_step),
+                ("download", "Downloading content", self._execute_download_step),
+                ("replace", "Processing content", self._execute_replace_step),
+                ("merge", "Merging files", self._execute_merge_step),
+            )
+            for step_number, (step_name, description, execute_step) in enumerate(steps, 1):
+                logger.info("\n[STEP %d] %s...", step_number, description)
+                step_result = await execute_step(config_data, metadata_file)
+                results["steps"][step_name] = step_result
                 
-                # Load existing metadata to verify it's valid
-                try:
-                    with open(metadata_file, 'r', encoding='utf-8') as f:
-                        existing_metadata = json.load(f)
-                    
-                    # Verify the metadata is for the same URL
-                    if existing_metadata.get("menu_url") == config_data["novel"]["menu_url"]:
-                        chapters_count = existing_metadata.get("chapter_count", 0)
-                        print(f"[SUCCESS] Found existing metadata with {chapters_count} chapters")
-                        parse_result = {
-                            "success": True, 
-                            "metadata_file": metadata_file, 
-                            "chapters_count": chapters_count,
-                            "skipped": True
-                        }
-                    else:
-                        print("[WARNING] Existing metadata is for different URL, will re-parse...")
-                        parse_result = await self._execute_parse_step(config_data, metadata_file)
-                except Exception as e:
-                    print(f"[WARNING] Error reading existing metadata: {e}")
-                    print("[INFO] Will re-parse chapters...")
-                    parse_result = await self._execute_parse_step(config_data, metadata_file)
-            else:
-                print("[INFO] No existing metadata found, parsing chapters...")
-                parse_result = await self._execute_parse_step(config_data, metadata_file)
-            
-            results["steps"]["parse"] = parse_result
-            
-            if not parse_result["success"]:
-                print("[ERROR] Parse step failed, stopping workflow")
-                results["success"] = False
-                results["error"] = parse_result.get("error", "Parse step failed")
-                return results
-            
-            # Step 2: Download content
-            print("\n[STEP 2] Downloading content...")
-            download_result = await self._execute_download_step(config_data, metadata_file)
-            results["steps"]["download"] = download_result
-            
-            if not download_result["success"]:
-                print("[ERROR] Download step failed, stopping workflow")
-                results["success"] = False
-                results["error"] = download_result.get("error", "Download step failed")
-                return results
-            
-            # Step 3: Process content (replace)
-            print("\n[STEP 3] Processing content...")
-            replace_result = await self._execute_replace_step(config_data, metadata_file)
-            results["steps"]["replace"] = replace_result
-            
-            if not replace_result["success"]:
-                print("[ERROR] Replace step failed, stopping workflow")
-                results["success"] = False
-                results["error"] = replace_result.get("error", "Replace step failed")
-                return results
-            
-            # Step 4: Merge files
-            print("\n[STEP 4] Merging files...")
-            merge_result = await self._execute_merge_step(config_data, metadata_file)
-            results["steps"]["merge"] = merge_result
-            
-            if not merge_result["success"]:
-                print("[ERROR] Merge step failed, stopping workflow")
-                results["success"] = False
-                results["error"] = merge_result.get("error", "Merge step failed")
-                return results
+                if not step_result["success"]:
+                    logger.error("[ERROR] %s step failed, stopping workflow", step_name.capitalize())
+                    results["success"] = False
+                    results["error"] = step_result.get("error", f"{step_name.capitalize()} step failed")
+                    return results
             
             # Workflow completed successfully
-            print("\n[SUCCESS] Task execution completed successfully!")
+            logger.info("\n[SUCCESS] Task execution completed successfully!")
             results["success"] = True
-            results["output_file"] = merge_result.get("output_file")
+            results["output_file"] = results["steps"]["merge"].get("output_file")
             
             return results
             
         except Exception as e:
-            print(f"[ERROR] Task execution failed: {e}")
+            logger.error("[ERROR] Task execution failed: %s", e)
             return {
                 "config_path": config_path,
                 "success": False,
                 "error": str(e),
                 "steps": results.get("steps", {})
             }
+        finally:
+            # Make sure a failed step never leaves the browser running
+            try:
+                await self._close_downloader()
+            except Exception as e:
+                logger.warning("Warning: Error stopping browser: %s", e)
+    
+    async def _run_parse_step(self, config_data: Dict[str, Any], metadata_file: str) -> Dict[str, Any]:
+        """Reuse existing metadata for the same URL, or run the parse step."""
+        # Read the metadata directly instead of checking exists() first; a missing file means no metadata yet.
+        # The full decode is cached and reused by the download step, so it is not worth a header-only read
+        try:
+            existing_metadata = self._load_metadata(metadata_file)
+        except FileNotFoundError:
+            logger.info("[INFO] No existing metadata found, parsing chapters...")
+            return await self._execute_parse_step(config_data, metadata_file)
+        except Exception as e:
+            logger.warning("[WARNING] Error reading existing metadata: %s", e)
+            logger.info("[INFO] Will re-parse chapters...")
+            return await self._execute_parse_step(config_data, metadata_file)
+        
+        logger.info("[INFO] Metadata file already exists: %s", metadata_file)
+        
+        # Verify the metadata is for the same URL (the file is named after parsing.hash,
+        # not the URL, so the stored menu_url is the only reliable check)
+        if existing_metadata.get("menu_url") != config_data["novel"]["menu_url"]:
+            logger.warning("[WARNING] Existing metadata is for different URL, will re-parse...")
+            return await self._execute_parse_step(config_data, metadata_file)
+        
+        logger.info("[INFO] Skipping parse step, using existing metadata...")
+        chapters_count = existing_metadata.get("chapter_count", 0)
+        logger.info("[SUCCESS] Found existing metadata with %s chapters", chapters_count)
+        return {
+            "success": True, 
+            "metadata_file": metadata_file, 
+            "chapters_count": chapters_count,
+            "skipped": True
+        }
     
     async def _execute_parse_step(self, config_data: Dict[str, Any], metadata_file: str) -> Dict[str, Any]:
         """Execute parse step."""
         try:
-            from .core import NovelDownloader
-            
-            # Create NovelDownloader instance
-            downloader = NovelDownloader(
+            # Start the browser and configure it for parsing
+            downloader = await self._get_downloader(
+                config_data,
                 chapter_xpath=config_data["parsing"]["chapter_xpath"],
                 content_xpath=config_data["parsing"]["content_xpath"],
                 concurrency=1,  # Not needed for parsing
-                proxy=config_data["browser"].get("proxy"),
                 content_regex=config_data["parsing"].get("content_regex"),
                 string_replacements=[],  # No string replacements during parsing
                 chapter_pagination_xpath=config_data["parsing"].get("chapter_pagination_xpath"),
                 chapter_list_pagination_xpath=config_data["parsing"].get("chapter_list_pagination_xpath"),
-                headless=config_data["browser"].get("headless", True),
-                custom_hash=config_data["parsing"].get("hash"),  # Use the hash from configuration
-                chrome_path=config_data["browser"].get("chrome_path")
             )
             
-            # Start browser and parse chapters
-            await downloader.start_browser()
+            # Parse chapters; the browser stays open for the download step
             chapters = await downloader.parse_chapters(config_data["novel"]["menu_url"])
-            await downloader.stop_browser()
+            
+            # The metadata file has just been rewritten
+            self._meta_cache.clear()
             
             if not chapters:
                 return {"success": False, "error": "No chapters found"}
@@ -180,31 +215,24 @@ class TaskExecutor:
     async def _execute_download_step(self, config_data: Dict[str, Any], metadata_file: str) -> Dict[str, Any]:
         """Execute download step."""
         try:
-            from .core import NovelDownloader
-            
-            # Load metadata from file
-            with open(metadata_file, 'r', encoding='utf-8') as f:
-                metadata = json.load(f)
+            # Load metadata from file (already decoded if the parse step was skipped)
+            metadata = self._load_metadata(metadata_file)
             
-            # Create NovelDownloader instance
-            downloader = NovelDownloader(
+            # Reuse the parse step's browser (or start one) with the download settings
+            downloader = await self._get_downloader(
+                config_data,
                 chapter_xpath=metadata.get("chapter_xpath"),
                 content_xpath=metadata.get("content_xpath"),
                 concurrency=config_data["downloading"].get("concurrency", 3),
-                proxy=config_data["browser"].get("proxy"),
                 content_regex=config_data["downloading"].get("content_regex") or metadata.get("content_regex"),
                 string_replacements=metadata.get("string_replacements", []),
                 chapter_pagination_xpath=metadata.get("chapter_pagination_xpath"),
                 chapter_list_pagination_xpath=metadata.get("chapter_list_pagination_xpath"),
-                headless=config_data["browser"].get("headless", True),
-                custom_hash=config_data["parsing"].get("hash"),  # Use the hash from configuration
-                chrome_path=config_data["browser"].get("chrome_path")
             )
             
-            # Start browser and download novel
-            await downloader.start_browser()
+            # Download novel, then release the browser; later steps only touch local files
             stats = await downloader.download_novel(metadata.get("menu_url"))
-            await downloader.stop_browser()
+            await self._close_downloader()
             
             return {"success": True, "stats": stats}
             
@@ -214,8 +242,6 @@ class TaskExecutor:
     async def _execute_replace_step(self, config_data: Dict[str, Any], metadata_file: str) -> Dict[str, Any]:
         """Execute replace step."""
         try:
-            from .cli import replace_chapter_strings
-            
             # Get processing configuration
             processing_config = config_data.get("processing", {})
             
@@ -238,8 +264,6 @@ class TaskExecutor:
     async def _execute_merge_step(self, config_data: Dict[str, Any], metadata_file: str) -> Dict[str, Any]:
         """Execute merge step."""
         try:
-            from .cli import merge_chapters
-            
             # Get output file path
             output_file = self.config_manager.get_output_file_path(config_data)
             
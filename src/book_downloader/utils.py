@@ -4,11 +4,32 @@ Utility functions for Novel Downloader.
 Contains helper functions for string processing, file operations, and content filtering.
 """
 
-import json
+import ast
+import html as html_lib
+import logging
+import mmap
 import re
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Iterable, List, Optional, Pattern, Tuple, Union
 from pathlib import Path
 from .config import chapters_dir
+from .metadata import _json_loads, _JSON_DECODE_ERRORS
+
+logger = logging.getLogger(__name__)
+
+# Characters not allowed in filenames on common filesystems
+_INVALID_FS_CHARS = '<>:"/\\|?*'
+_SANITIZE_TABLE = str.maketrans({c: '_' for c in _INVALID_FS_CHARS})
+# Sanitizing plus spaces to underscores, for matching titles to file names
+_NORMALIZE_TABLE = str.maketrans({c: '_' for c in _INVALID_FS_CHARS + ' '})
+
+# Flags every user-supplied content filter is compiled with
+_REGEX_FLAGS = re.MULTILINE | re.DOTALL
+
+# Fallback title scan for chapter files lxml cannot parse
+_H1_RE = re.compile(rb'<h1[^>]*>(.*?)</h1>', re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r'<[^>]+>')
 
 
 def parse_string_replacements(replacements_str: Optional[str]) -> List[List[str]]:
@@ -27,21 +48,15 @@ def parse_string_replacements(replacements_str: Optional[str]) -> List[List[str]
     
     try:
         # First try parsing as-is
-        replacements = json.loads(replacements_str)
-    except json.JSONDecodeError:
+        replacements = _json_loads(replacements_str)
+    except _JSON_DECODE_ERRORS:
         try:
-            # If that fails, try converting single quotes to double quotes
-            # This is a simple approach - replace single quotes with double quotes
-            # but we need to be careful about quotes inside strings
-            import re
-            
-            # Convert single quotes to double quotes, but be careful about quotes inside strings
-            # This is a simplified approach that works for most cases
-            converted_str = replacements_str.replace("'", '"')
-            replacements = json.loads(converted_str)
-        except json.JSONDecodeError as e:
-            print(f"❌ Error parsing string replacements: {e}")
-            print("Expected format: [['old1','new1'],['old2','new2']] or [[\"old1\",\"new1\"],[\"old2\",\"new2\"]]")
+            # Fall back to Python literal syntax, which accepts single quotes without
+            # mangling apostrophes inside the strings
+            replacements = ast.literal_eval(replacements_str)
+        except (ValueError, SyntaxError) as e:
+            logger.error("❌ Error parsing string replacements: %s", e)
+            logger.error("Expected format: [['old1','new1'],['old2','new2']] or [[\"old1\",\"new1\"],[\"old2\",\"new2\"]]")
             return []
     
     if not isinstance(replacements, list):
@@ -58,13 +73,22 @@ def parse_string_replacements(replacements_str: Optional[str]) -> List[List[str]
     return result
 
 
-def process_content_with_regex(content: str, content_regex: Optional[str]) -> str:
+# Content filters rely on re's leftmost, non-overlapping findall and on capture
+# groups; DFA engines such as Hyperscan report every match end without groups
+@lru_cache(maxsize=128)
+def _compile_content_regex(pattern: str) -> Pattern:
+    """Compile a content filter pattern once per distinct pattern string."""
+    return re.compile(pattern, _REGEX_FLAGS)
+
+
+def process_content_with_regex(content: str, content_regex: Optional[Union[str, Pattern]]) -> str:
     """
     Process content with regex filtering.
     
     Args:
         content: Raw content text
-        content_regex: Regex pattern to filter content
+        content_regex: Regex pattern to filter content, either as a string or
+            precompiled with re.MULTILINE | re.DOTALL
         
     Returns:
         Processed content text
@@ -73,34 +97,116 @@ def process_content_with_regex(content: str, content_regex: Optional[str]) -> st
         return content
         
     try:
-        regex_pattern = re.compile(content_regex, re.MULTILINE | re.DOTALL)
+        if isinstance(content_regex, str):
+            regex_pattern = _compile_content_regex(content_regex)
+        else:
+            regex_pattern = content_regex
         matches = regex_pattern.findall(content)
         if matches:
             # If regex has groups, join them; otherwise use the full matches
-            if isinstance(matches[0], tuple):
-                # Handle multiple capture groups - join non-empty groups
-                clean_matches = []
-                for match in matches:
-                    joined_match = ''.join(group for group in match if group)
-                    if joined_match.strip():
-                        clean_matches.append(joined_match.strip())
-                processed_content = '\n'.join(clean_matches)
+            if regex_pattern.groups > 1:
+                # Handle multiple capture groups - unmatched groups are empty strings, so a plain join skips them
+                matches_text = map(''.join, matches)
             else:
                 # Single capture group or no groups
-                clean_matches = [match.strip() for match in matches if match.strip()]
-                processed_content = '\n'.join(clean_matches)
-            print(f"🔍 Applied regex filter, extracted {len(matches)} matches")
+                matches_text = matches
+            clean_matches = [match for match in map(str.strip, matches_text) if match]
+            processed_content = '\n'.join(clean_matches)
+            logger.debug("🔍 Applied regex filter, extracted %d matches", len(matches))
         else:
-            print("⚠️  Regex pattern found no matches")
-            print(f"   Content preview: {content[:100]}...")
-            print(f"   Regex pattern: {content_regex}")
+            logger.warning("⚠️  Regex pattern found no matches")
+            logger.warning("   Content preview: %s...", content[:100])
+            logger.warning("   Regex pattern: %s", regex_pattern.pattern)
             processed_content = ""
         return processed_content
     except re.error as e:
-        print(f"❌ Invalid regex pattern: {e}")
+        logger.error("❌ Invalid regex pattern: %s", e)
         return content
 
 
+def _overlaps(a: str, b: str) -> bool:
+    """Return True if an occurrence of ``a`` and one of ``b`` can share characters."""
+    if a in b or b in a:
+        return True
+    return any(a.endswith(b[:k]) or b.endswith(a[:k]) for k in range(1, min(len(a), len(b))))
+
+
+def _joins_group(group: List[Tuple[str, str]], old_str: str) -> bool:
+    """
+    Check whether a multi-character rule can be applied in the same pass as ``group``.
+    
+    Applying the group in one scan matches applying it rule by rule only if the new
+    rule can never match text that an earlier rule touched: it must not overlap any
+    earlier old or new string, and no earlier rule may delete text, since a deletion
+    can join its neighbours into a fresh match.
+    
+    Args:
+        group: (old, new) pairs already in the group, in order
+        old_str: Old string of the candidate rule
+        
+    Returns:
+        True if the rule can be added to the group
+    """
+    return all(
+        new and not _overlaps(old, old_str) and not _overlaps(new, old_str)
+        for old, new in group
+    )
+
+
+@lru_cache(maxsize=32)
+def _replacement_plan(rules: Tuple[Tuple[str, str], ...]) -> List[Union[dict, Tuple[str, str], Tuple[Pattern, dict]]]:
+    """
+    Group replacement rules into steps that give the same result as applying them in order.
+    
+    Consecutive single-character rules share one str.translate table, as long as
+    no rule in the group would act on text produced by an earlier one. Consecutive
+    multi-character rules that cannot interact share one alternation regex.
+    
+    Args:
+        rules: Tuple of (old, new) string pairs
+        
+    Returns:
+        List of steps: a translate table, an (old, new) pair, or a
+        (compiled alternation, old-to-new mapping) pair
+    """
+    plan = []
+    table = {}
+    produced = set()
+    group = []
+    
+    def flush_table():
+        nonlocal table, produced
+        if table:
+            plan.append(table)
+            table = {}
+            produced = set()
+    
+    def flush_group():
+        if len(group) == 1:
+            plan.append(group[0])
+        elif group:
+            pattern = re.compile('|'.join(re.escape(old) for old, _ in group))
+            plan.append((pattern, dict(group)))
+        group.clear()
+    
+    for old_str, new_str in rules:
+        if len(old_str) == 1:
+            flush_group()
+            if old_str in produced:
+                flush_table()
+            # A repeated old character was already replaced by the earlier rule
+            table.setdefault(ord(old_str), new_str)
+            produced.update(new_str)
+        else:
+            flush_table()
+            if not _joins_group(group, old_str):
+                flush_group()
+            group.append((old_str, new_str))
+    flush_table()
+    flush_group()
+    return plan
+
+
 def apply_string_replacements(content: str, string_replacements: List[List[str]]) -> str:
     """
     Apply string replacements to content.
@@ -112,16 +218,55 @@ def apply_string_replacements(content: str, string_replacements: List[List[str]]
     Returns:
         Processed content text
     """
+    if not string_replacements:
+        return content
+    
     processed_content = content
+    # Checked once per call, so quiet runs skip both the messages and the match detection
+    debug = logger.isEnabledFor(logging.DEBUG)
     
-    for old_str, new_str in string_replacements:
-        if old_str in processed_content:
-            processed_content = processed_content.replace(old_str, new_str)
-            print(f"🔄 Replaced '{old_str}' with '{new_str}'")
+    for step in _replacement_plan(tuple(map(tuple, string_replacements))):
+        if isinstance(step, dict):
+            replaced = processed_content.translate(step)
+            if debug and (len(replaced) != len(processed_content) or replaced != processed_content):
+                logger.debug("🔄 Applied %d single-character replacements", len(step))
+        elif isinstance(step[0], re.Pattern):
+            pattern, mapping = step
+            replaced, count = pattern.subn(lambda m: mapping[m.group()], processed_content)
+            if debug and count:
+                logger.debug("🔄 Applied %d replacements from %d rules in one pass", count, len(mapping))
+        else:
+            old_str, new_str = step
+            replaced = processed_content.replace(old_str, new_str)
+            # str.replace hands back the same object when nothing matched, and a length
+            # change proves a match; only equal-length rules need the full comparison
+            if debug and replaced is not processed_content and (
+                    len(replaced) != len(processed_content) or replaced != processed_content):
+                logger.debug("🔄 Replaced '%s' with '%s'", old_str, new_str)
+        processed_content = replaced
     
     return processed_content
 
 
+def process_content(content: str, content_regex: Optional[Union[str, Pattern]],
+                    string_replacements: List[List[str]]) -> str:
+    """
+    Filter content with a regex, then apply string replacements to the result.
+    
+    Replacements run over the joined filter output rather than per match, so rules
+    that span the newline between two matches keep working.
+    
+    Args:
+        content: Raw content text
+        content_regex: Regex pattern to filter content, as for process_content_with_regex
+        string_replacements: List of [old, new] string pairs
+        
+    Returns:
+        Processed content text
+    """
+    return apply_string_replacements(process_content_with_regex(content, content_regex), string_replacements)
+
+
 def sanitize_filename(filename: str) -> str:
     """
     Sanitize filename by removing invalid characters.
@@ -132,28 +277,113 @@ def sanitize_filename(filename: str) -> str:
     Returns:
         Sanitized filename safe for filesystem
     """
-    return re.sub(r'[<>:"/\\|?*]', '_', filename)
+    return filename.translate(_SANITIZE_TABLE)
+
+
+def _scan_plain_h1(path_str: str) -> Optional[str]:
+    """
+    Find the first h1 by searching the file's raw bytes, without parsing HTML.
+    
+    Only handles the layout chapter files are written with: a lowercase h1 whose
+    content is plain text. Anything else is left to the HTML parser.
+    
+    Args:
+        path_str: Chapter file path as a string
+        
+    Returns:
+        Unescaped h1 text, or None if the file needs a real parse
+    """
+    with open(path_str, 'rb') as f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be mapped
+            return None
+        with mm:
+            start = mm.find(b'<h1')
+            if start < 0 or mm[start + 3:start + 4] not in (b'>', b' ', b'\t', b'\n', b'\r'):
+                return None
+            tag_end = mm.find(b'>', start)
+            end = mm.find(b'</h1>', tag_end)
+            if end < 0 or b'"' in mm[start:tag_end] or b"'" in mm[start:tag_end]:
+                return None
+            inner = mm[tag_end + 1:end]
+    if b'<' in inner:
+        return None
+    return html_lib.unescape(inner.decode('utf-8', errors='replace')).strip()
+
+
+@lru_cache(maxsize=8192)
+def _cached_title(path_str: str, mtime_ns: int, size: int) -> str:
+    """
+    Read and parse a chapter file's title, memoized per path, mtime and size.
+    
+    Args:
+        path_str: Chapter file path as a string
+        mtime_ns: File modification time, so edited files are re-read
+        size: File size, catching rewrites within the filesystem's timestamp resolution
+        
+    Returns:
+        Text of the first h1 tag, or the file stem if there is none or it is empty
+    """
+    chapter_file = Path(path_str)
+    title = _scan_plain_h1(path_str)
+    if title is not None:
+        return title or chapter_file.stem
+    
+    from lxml import etree
+    try:
+        # Stop at the first h1 instead of building a tree for the whole chapter
+        for _, elem in etree.iterparse(path_str, events=('end',), tag='h1', html=True, encoding='utf-8'):
+            return ''.join(elem.itertext()).strip() or chapter_file.stem
+    except etree.XMLSyntaxError:
+        match = _H1_RE.search(chapter_file.read_bytes())
+        if match:
+            text = _TAG_RE.sub('', match.group(1).decode('utf-8', errors='replace'))
+            return html_lib.unescape(text).strip() or chapter_file.stem
+    return chapter_file.stem
 
 
 def extract_chapter_title(chapter_file: Path) -> str:
     """Extract chapter title from HTML file's h1 tag."""
     try:
-        with open(chapter_file, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        from lxml import html
-        tree = html.fromstring(content)
-        title_elems = tree.xpath('//h1')
-        
-        if len(title_elems) > 0:
-            return title_elems[0].text_content().strip()
-        else:
-            return chapter_file.stem
+        stat = chapter_file.stat()
+        return _cached_title(str(chapter_file), stat.st_mtime_ns, stat.st_size)
     except Exception as e:
-        print(f"Warning: Could not extract title from {chapter_file.name}: {e}")
+        logger.warning("Warning: Could not extract title from %s: %s", chapter_file.name, e)
         return chapter_file.stem
 
 
+extract_chapter_title.cache_clear = _cached_title.cache_clear
+
+
+def extract_chapter_titles(chapter_files: Iterable[Path], workers: int = 8) -> List[str]:
+    """
+    Extract titles from many chapter files in parallel.
+    
+    lxml releases the GIL while parsing, so threads overlap both file I/O and parsing.
+    
+    Args:
+        chapter_files: Chapter file paths
+        workers: Maximum number of worker threads
+        
+    Returns:
+        Titles in the same order as chapter_files
+    """
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(extract_chapter_title, chapter_files))
+
+
+def _chapter_key(name: str) -> str:
+    """
+    Normalize a chapter title or file stem for matching.
+    
+    Sanitizing, replacing spaces and lowercasing lets a title match its file whether
+    or not the file name was sanitized or had spaces replaced.
+    """
+    return name.translate(_NORMALIZE_TABLE).lower()
+
+
 def sort_chapters_by_metadata(chapter_files: List[Path], metadata_chapters: List[dict], reverse: bool = False) -> List[Path]:
     """
     Sort chapter files based on metadata chapter order.
@@ -166,43 +396,30 @@ def sort_chapters_by_metadata(chapter_files: List[Path], metadata_chapters: List
     Returns:
         Sorted list of chapter files
     """
-    # Create a mapping from chapter title to file path
-    title_to_file = {}
-    for chapter_file in chapter_files:
-        # Extract title from filename (remove .html extension)
-        filename = chapter_file.stem
-        title_to_file[filename] = chapter_file
+    # Map each file's normalized stem to the file, so every metadata title needs one lookup
+    norm_to_file = {_chapter_key(chapter_file.stem): chapter_file for chapter_file in chapter_files}
     
     # Create a mapping from chapter index to file path based on metadata
     index_to_file = {}
     for chapter_info in metadata_chapters:
         title = chapter_info.get("title", "")
-        index = chapter_info.get("index", 0)
         
         if title:
-            # Try to match with sanitized filename
-            safe_title = sanitize_filename(title)
-            if safe_title in title_to_file:
-                index_to_file[index] = title_to_file[safe_title]
-            # Also try original title in case filename wasn't sanitized
-            elif title in title_to_file:
-                index_to_file[index] = title_to_file[title]
-            # Try with spaces replaced by underscores
-            elif title.replace(' ', '_') in title_to_file:
-                index_to_file[index] = title_to_file[title.replace(' ', '_')]
-    
-    # Sort by index from metadata
-    sorted_indices = sorted(index_to_file.keys(), reverse=reverse)
-    sorted_files = [index_to_file[i] for i in sorted_indices]
+            chapter_file = norm_to_file.get(_chapter_key(title))
+            if chapter_file is not None:
+                index_to_file[chapter_info.get("index", 0)] = chapter_file
+    
+    # Sort by index from metadata; indices arrive mostly in order, which Timsort handles in one pass
+    sorted_files = [index_to_file[i] for i in sorted(index_to_file, reverse=reverse)]
     
     # Add any unmatched files at the end
-    matched_files = set(sorted_files)
-    unmatched_files = [f for f in chapter_files if f not in matched_files]
+    matched_ids = {id(f) for f in sorted_files}
+    unmatched_files = [f for f in chapter_files if id(f) not in matched_ids]
     if unmatched_files:
-        print(f"Warning: {len(unmatched_files)} chapter files could not be matched with metadata:")
+        logger.warning("Warning: %d chapter files could not be matched with metadata:", len(unmatched_files))
         for f in unmatched_files:
-            print(f"  - {f.name}")
+            logger.warning("  - %s", f.name)
         sorted_files.extend(unmatched_files)
     
-    print(f"Sorted {len(sorted_files)} chapters using metadata order ({'reverse' if reverse else 'normal'})")
+    logger.info("Sorted %d chapters using metadata order (%s)", len(sorted_files), 'reverse' if reverse else 'normal')
     return sorted_files
@@ -0,0 +1,33 @@
+"""
+Tests for EPUB generation.
+"""
+
+import zipfile
+from src.book_downloader import epub_generator
+
+
+class TestCreateEpub:
+    """Test EPUB packaging."""
+    
+    def test_non_ascii_titles_get_unique_entries(self, temp_dir, monkeypatch):
+        """Test chapters whose titles have no ASCII characters don't share a zip entry."""
+        titles = ["第一章 开始", "第二章 结束"]
+        chapter_files = []
+        for title in titles:
+            chapter_file = temp_dir / f"{title}.html"
+            chapter_file.write_text(f"<h1>{title}</h1>\n<div class='chapter-content'>\n正文</div>\n", encoding='utf-8')
+            chapter_files.append(chapter_file)
+        metadata = {"chapters": [{"index": i + 1, "title": title} for i, title in enumerate(titles)]}
+        monkeypatch.setattr(epub_generator, "find_best_metadata", lambda: metadata)
+        monkeypatch.setattr(epub_generator, "temp_dir", temp_dir)
+        
+        output_file = temp_dir / "book.epub"
+        epub_generator.create_epub(str(output_file), "Book", "Author", chapter_files)
+        
+        with zipfile.ZipFile(output_file) as epub:
+            names = epub.namelist()
+            opf = epub.read("OEBPS/content.opf").decode('utf-8')
+        assert len(names) == len(set(names))
+        assert "OEBPS/chapter_001.xhtml" in names
+        assert "OEBPS/chapter_002.xhtml" in names
+        assert opf.count('href="chapter_001.xhtml"') == 1
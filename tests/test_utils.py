@@ -2,13 +2,16 @@
 Tests for utility functions.
 """
 
+import re
 import pytest
 from src.book_downloader.utils import (
     parse_string_replacements,
     process_content_with_regex,
+    process_content,
     apply_string_replacements,
     sanitize_filename,
     extract_chapter_title,
+    extract_chapter_titles,
 )
 from pathlib import Path
 
@@ -26,6 +29,11 @@ class TestParseStringReplacements:
         result = parse_string_replacements("[['old1','new1'],['old2','new2']]")
         assert result == [["old1", "new1"], ["old2", "new2"]]
     
+    def test_parse_single_quotes_with_apostrophe(self):
+        """Test apostrophes survive in single-quoted input."""
+        result = parse_string_replacements("[['<p>',''],[\"don't\",'do not']]")
+        assert result == [["<p>", ""], ["don't", "do not"]]
+    
     def test_parse_empty(self):
         """Test parsing empty string."""
         result = parse_string_replacements("")
@@ -52,6 +60,13 @@ class TestProcessContentWithRegex:
         result = process_content_with_regex(content, r"Chapter \d+: .*")
         assert "Chapter 1: The Beginning" in result
         assert "Chapter 2: The End" in result
+    
+    def test_compiled_regex(self):
+        """Test with a precompiled regex pattern."""
+        content = "Chapter 1: The Beginning\nSome text\nChapter 2: The End"
+        pattern = re.compile(r"Chapter \d+: .*?$", re.MULTILINE | re.DOTALL)
+        result = process_content_with_regex(content, pattern)
+        assert result == "Chapter 1: The Beginning\nChapter 2: The End"
 
 
 class TestApplyStringReplacements:
@@ -74,6 +89,28 @@ class TestApplyStringReplacements:
         content = "Hello world, this is a test"
         result = apply_string_replacements(content, [["world", "universe"], ["test", "example"]])
         assert result == "Hello universe, this is a example"
+    
+    def test_single_character_replacements_apply_in_order(self):
+        """Test that chained single-character rules still apply one after another."""
+        content = "a-b, c"
+        result = apply_string_replacements(content, [["a", "b"], ["b", "c"], [",", ""], ["-", " "]])
+        assert result == "c c c"
+    
+    def test_deletion_can_expose_later_match(self):
+        """Test that a later rule still sees text joined by an earlier deletion."""
+        content = "<</p>p>text"
+        result = apply_string_replacements(content, [["</p>", ""], ["<p>", ""], ["&nbsp;", " "]])
+        assert result == "text"
+
+
+class TestProcessContent:
+    """Test the combined regex filter and replacement pipeline."""
+    
+    def test_replacement_spans_filtered_matches(self):
+        """Test replacements see the newline joining two regex matches."""
+        content = "<p>end of line</p><p>next line</p>"
+        result = process_content(content, r"<p>(.*?)</p>", [["line\nnext", "line, next"]])
+        assert result == "end of line, next line"
 
 
 class TestSanitizeFilename:
@@ -113,3 +150,38 @@ class TestExtractChapterTitle:
         
         result = extract_chapter_title(chapter_file)
         assert result == "test"  # filename without extension
+    
+    def test_extract_after_file_changes(self, temp_dir):
+        """Test cached title is refreshed when the file is rewritten."""
+        import os
+        chapter_file = temp_dir / "test.html"
+        chapter_file.write_text("<html><body><h1>Old</h1></body></html>")
+        assert extract_chapter_title(chapter_file) == "Old"
+        
+        chapter_file.write_text("<html><body><h1>New</h1></body></html>")
+        stat = chapter_file.stat()
+        os.utime(chapter_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert extract_chapter_title(chapter_file) == "New"
+    
+    def test_extract_many_keeps_order(self, temp_dir):
+        """Test batch extraction returns titles in input order."""
+        chapter_files = []
+        for i in range(20):
+            chapter_file = temp_dir / f"chapter{i}.html"
+            chapter_file.write_text(f"<html><body><h1>Chapter {i}</h1></body></html>")
+            chapter_files.append(chapter_file)
+        
+        result = extract_chapter_titles(chapter_files, workers=4)
+        assert result == [f"Chapter {i}" for i in range(20)]
+    
+    def test_extract_after_same_mtime_rewrite(self, temp_dir):
+        """Test a rewrite that keeps the mtime but changes the size is re-read."""
+        import os
+        chapter_file = temp_dir / "test.html"
+        chapter_file.write_text("<html><body><h1>Old</h1></body></html>")
+        mtime_ns = chapter_file.stat().st_mtime_ns
+        assert extract_chapter_title(chapter_file) == "Old"
+        
+        chapter_file.write_text("<html><body><h1>Longer</h1></body></html>")
+        os.utime(chapter_file, ns=(mtime_ns, mtime_ns))
+        assert extract_chapter_title(chapter_file) == "Longer"